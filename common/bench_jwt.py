@@ -0,0 +1,51 @@
+# bench_jwt.py
+# 요청당 인증 오버헤드 마이크로벤치마크
+#   JWT_SECRET_KEY=dev python common/bench_jwt.py [N]
+# - uncached: 매 요청 서명/클레임 검증 (기존 동작)
+# - cached  : 검증 완료 토큰 LRU 적중
+import os
+import sys
+import time
+
+os.environ.setdefault("JWT_SECRET_KEY", "bench-secret")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jwt  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+
+from common import jwt_auth  # noqa: E402
+
+
+def _request(token: str) -> Request:
+    return Request({"type": "http", "headers": [(b"authorization", f"Bearer {token}".encode())]})
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    token = jwt.encode(
+        {"_id": "64b7f0c2a1b2c3d4e5f60718", "exp": int(time.time()) + 3600},
+        jwt_auth.JWT_SHARED_SECRET,
+        algorithm=jwt_auth.ALGORITHM,
+    )
+    req = _request(token)
+
+    t0 = time.perf_counter()
+    for _ in range(n):
+        jwt_auth.clear_token_cache()
+        jwt_auth.user_id_from_request(req)
+    uncached = time.perf_counter() - t0
+
+    jwt_auth.user_id_from_request(req)
+    t0 = time.perf_counter()
+    for _ in range(n):
+        jwt_auth.user_id_from_request(req)
+    cached = time.perf_counter() - t0
+
+    print(f"requests: {n} ({jwt_auth.ALGORITHM})")
+    print(f"uncached: {uncached * 1e6 / n:7.2f} µs/request")
+    print(f"cached  : {cached * 1e6 / n:7.2f} µs/request")
+    print(f"cache   : {jwt_auth.token_cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+# http_range.py
+# HTTP Range 헤더 파싱 (you/ 산출물 다운로드, gal/ 영상 스트리밍 공용)
+from typing import Optional, Tuple
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    'bytes=a-b' 단일 구간만 처리 → (start, end) 포함 구간.
+    다중 구간/형식 오류는 None(전체 응답), 만족 불가 구간은 ValueError(416).
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_s, sep, end_s = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        start = int(start_s) if start_s else None
+        end = int(end_s) if end_s else None
+    except ValueError:
+        return None
+    if start is None:  # 접미 구간: 마지막 N바이트
+        if end is None:
+            return None
+        if end == 0 or size == 0:
+            raise ValueError("unsatisfiable range")
+        return max(size - end, 0), size - 1
+    if start >= size or (end is not None and start > end):
+        raise ValueError("unsatisfiable range")
+    return start, size - 1 if end is None else min(end, size - 1)
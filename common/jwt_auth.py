@@ -0,0 +1,124 @@
+# jwt_auth.py
+# you/ 와 gal/ FastAPI 앱이 함께 쓰는 JWT 인증 모듈
+# - 검증이 끝난 토큰은 exp까지 LRU에 보관 → 같은 토큰 재요청 시 서명 검증 생략
+# - RS256 공개키는 한 번만 파싱해 재사용
+import os
+import time
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import jwt
+from jwt import InvalidTokenError, ExpiredSignatureError
+from fastapi import Request, HTTPException
+
+ALGORITHM = os.getenv("AUTH_ALGORITHM") or os.getenv("JWT_ALGORITHM") or "HS256"
+# 아무 키나 있으면 사용: JWT_SHARED_SECRET > JWT_SECRET_KEY > SECRET_KEY
+JWT_SHARED_SECRET = os.getenv("JWT_SHARED_SECRET") or os.getenv("JWT_SECRET_KEY") or os.getenv("SECRET_KEY")
+JWT_PUBLIC_KEY = os.getenv("JWT_PUBLIC_KEY")  # RS256일 때만
+JWT_ISSUER = os.getenv("JWT_ISSUER")
+JWT_AUDIENCE = os.getenv("JWT_AUDIENCE")
+LEEWAY = int(os.getenv("JWT_LEEWAY", "30"))
+TOKEN_CACHE_SIZE = int(os.getenv("JWT_TOKEN_CACHE_SIZE", "4096"))
+
+# 토큰 payload에서 사용자 식별자로 인정하는 클레임 (앞쪽 우선)
+USER_ID_CLAIMS = ("sub", "_id", "uid", "user_id")
+
+
+# =========================
+# 키
+# =========================
+@lru_cache(maxsize=4)
+def _load_public_key(pem: str):
+    from cryptography.hazmat.primitives.serialization import load_pem_public_key
+    return load_pem_public_key(pem.replace("\\n", "\n").encode("utf-8"))
+
+def _key():
+    if ALGORITHM == "HS256":
+        if not JWT_SHARED_SECRET:
+            raise RuntimeError("Missing JWT_SHARED_SECRET/JWT_SECRET_KEY")
+        return JWT_SHARED_SECRET
+    if ALGORITHM == "RS256":
+        if not JWT_PUBLIC_KEY:
+            raise RuntimeError("Missing JWT_PUBLIC_KEY for RS256")
+        return _load_public_key(JWT_PUBLIC_KEY)
+    raise RuntimeError(f"Unsupported alg: {ALGORITHM}")
+
+
+# =========================
+# 검증 + 캐시
+# =========================
+_cache_lock = threading.Lock()
+_token_cache: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()  # token → (payload, exp)
+_cache_stats = {"hits": 0, "misses": 0}
+
+def _decode_uncached(token: str) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {"algorithms": [ALGORITHM], "leeway": LEEWAY, "options": {"require": ["exp"]}}
+    if JWT_ISSUER:
+        kwargs["issuer"] = JWT_ISSUER
+    if JWT_AUDIENCE:
+        kwargs["audience"] = JWT_AUDIENCE
+    return jwt.decode(token, _key(), **kwargs)
+
+def decode_token(token: str) -> Dict[str, Any]:
+    """서명/클레임 검증. 이미 검증된 토큰은 exp 전까지 캐시에서 바로 반환."""
+    now = time.time()
+    with _cache_lock:
+        hit = _token_cache.get(token)
+        if hit is not None:
+            if now < hit[1]:
+                _token_cache.move_to_end(token)
+                _cache_stats["hits"] += 1
+                return hit[0]
+            del _token_cache[token]
+        _cache_stats["misses"] += 1
+
+    payload = _decode_uncached(token)  # 실패 시 예외 → 캐시하지 않음
+
+    with _cache_lock:
+        _token_cache[token] = (payload, float(payload["exp"]))
+        _token_cache.move_to_end(token)
+        while len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return payload
+
+def clear_token_cache() -> None:
+    with _cache_lock:
+        _token_cache.clear()
+
+def token_cache_info() -> Dict[str, int]:
+    with _cache_lock:
+        return {**_cache_stats, "size": len(_token_cache), "max_size": TOKEN_CACHE_SIZE}
+
+
+# =========================
+# FastAPI 연동
+# =========================
+def bearer_token(req: Request) -> Optional[str]:
+    auth = req.headers.get("authorization")
+    if not auth:
+        return None
+    p = auth.split()
+    return p[1] if len(p) == 2 and p[0].lower() == "bearer" else None
+
+def user_id_from_request(req: Request) -> str:
+    """Authorization: Bearer ... → user_id(str). 실패 시 401."""
+    token = bearer_token(req)
+    if not token:
+        raise HTTPException(401, "Missing Bearer token")
+    try:
+        payload = decode_token(token)
+    except ExpiredSignatureError:
+        raise HTTPException(401, "Token expired")
+    except InvalidTokenError as e:
+        raise HTTPException(401, f"Invalid token: {e}")
+    except RuntimeError as e:  # 서버 키 설정 누락/지원하지 않는 알고리즘
+        raise HTTPException(500, f"JWT is not configured on the server: {e}")
+    uid = next((payload[c] for c in USER_ID_CLAIMS if payload.get(c)), None)
+    if not uid:
+        raise HTTPException(401, "Token missing user id")
+    return str(uid)
+
+async def get_current_user(req: Request) -> str:
+    return user_id_from_request(req)
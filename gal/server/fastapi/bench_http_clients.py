@@ -0,0 +1,71 @@
+# bench_http_clients.py
+# 포트폴리오 페이지 1회 로드(레포 목록 + 레포별 언어/README/기여도)의 GitHub 호출 시간 비교
+#   GITHUB_TOKEN=... python bench_http_clients.py <username> [레포 수=6] [반복=3]
+# - per-request: 호출마다 httpx.AsyncClient 생성 (기존 방식, 매번 TCP+TLS)
+# - shared     : core/http_clients.py 공유 클라이언트 (keep-alive + HTTP/2)
+import sys
+import time
+import asyncio
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from core import http_clients  # noqa: E402
+from core.http_clients import GITHUB_API_URL, GITHUB_TOKEN  # noqa: E402
+
+HEADERS = {"Authorization": f"token {GITHUB_TOKEN}"} if GITHUB_TOKEN else {}
+
+
+async def _get_per_request(path: str) -> httpx.Response:
+    async with httpx.AsyncClient() as client:
+        return await client.get(f"{GITHUB_API_URL}{path}", headers=HEADERS)
+
+async def _get_shared(path: str) -> httpx.Response:
+    return await http_clients.github_client().get(path)
+
+async def page_load(get, username: str, n_repos: int) -> int:
+    """프런트가 포트폴리오 페이지에서 보내는 순서 그대로: 목록 → 레포별 3개 병렬."""
+    repos = (await get(f"/users/{username}/repos")).json()[:n_repos]
+    calls = []
+    for r in repos:
+        name = r["name"]
+        calls += [
+            get(f"/repos/{username}/{name}/languages"),
+            get(f"/repos/{username}/{name}/readme"),
+            get(f"/repos/{username}/{name}/contributors"),
+        ]
+    await asyncio.gather(*calls)
+    return 1 + len(calls)
+
+
+async def run(label: str, get, username: str, n_repos: int, rounds: int) -> None:
+    times = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        n_calls = await page_load(get, username, n_repos)
+        times.append(time.perf_counter() - t0)
+    print(f"{label:<12} calls/page={n_calls:3d}  first={times[0] * 1000:7.1f} ms  "
+          f"best={min(times) * 1000:7.1f} ms  avg={sum(times) / len(times) * 1000:7.1f} ms")
+
+
+async def main() -> None:
+    if len(sys.argv) < 2:
+        print("usage: python bench_http_clients.py <username> [repos] [rounds]")
+        sys.exit(1)
+    username = sys.argv[1]
+    n_repos = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+
+    await run("per-request", _get_per_request, username, n_repos, rounds)
+    await http_clients.start_http_clients()
+    try:
+        await run("shared", _get_shared, username, n_repos, rounds)
+        print(f"http2: {http_clients.HTTP2_ENABLED}")
+    finally:
+        await http_clients.close_http_clients()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,26 @@
+# 공용 JWT 모듈(common/jwt_auth.py) 연결 + gal 전용 검증(ObjectId)
+import sys
+from pathlib import Path
+
+from bson import ObjectId
+from fastapi import Request, HTTPException
+
+_REPO_ROOT = Path(__file__).resolve().parents[4]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.append(str(_REPO_ROOT))
+
+from common.jwt_auth import user_id_from_request  # noqa: E402
+
+
+def get_current_user_id(request: Request) -> str:
+    """
+    JWT 토큰에서 사용자 ObjectId 문자열 추출({_id}).
+    """
+    user_id = user_id_from_request(request)
+    if not ObjectId.is_valid(user_id):
+        raise HTTPException(status_code=401, detail="Invalid user id in token")
+    return user_id
+
+async def require_user_id(request: Request) -> str:
+    """Depends()용 (스레드풀을 거치지 않는 async 버전)."""
+    return get_current_user_id(request)
@@ -0,0 +1,118 @@
+# 레포별 기여도 집계 (contributors 전체 페이지 기준)
+# - per_page=100으로 첫 페이지를 받고 Link의 last 페이지까지 나머지를 동시에 요청
+# - 레포 단위로 {login: 커밋 수} + 총합을 캐시 → 사용자 조회는 dict 한 번
+# - TTL이 지나면 기존 값을 돌려주면서 백그라운드에서 갱신 (stale-while-revalidate)
+import os
+import time
+import asyncio
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import httpx
+from fastapi import HTTPException
+
+from core.github_cache import github_get
+
+CONTRIBUTION_STATS_TTL = float(os.getenv("CONTRIBUTION_STATS_TTL", "600"))  # 이 시간이 지나면 백그라운드 갱신
+CONTRIBUTION_STATS_MAX_STALE = float(os.getenv("CONTRIBUTION_STATS_MAX_STALE", str(24 * 3600)))  # 이보다 오래되면 갱신을 기다림
+CONTRIBUTION_PAGE_CONCURRENCY = int(os.getenv("CONTRIBUTION_PAGE_CONCURRENCY", "4"))
+CONTRIBUTION_STATS_MAX_ENTRIES = int(os.getenv("CONTRIBUTION_STATS_MAX_ENTRIES", "1024"))  # 레포 수 기준 LRU
+PER_PAGE = 100  # GitHub 최대값
+
+
+class RepoContributions(NamedTuple):
+    by_login: Dict[str, int]  # 소문자 login → 커밋 수
+    total: int
+    fetched_at: float
+
+
+def _last_page(resp: httpx.Response) -> int:
+    last = resp.links.get("last", {}).get("url")
+    if not last:
+        return 1
+    try:
+        return int(httpx.URL(last).params.get("page", "1"))
+    except ValueError:
+        return 1
+
+def _check(resp: httpx.Response) -> list:
+    if resp.status_code == 204:  # 빈 레포
+        return []
+    if resp.status_code != 200:
+        raise HTTPException(status_code=resp.status_code, detail="Failed to fetch contributors")
+    return resp.json()
+
+
+class ContributionStats:
+    def __init__(self, ttl: float, max_stale: float, max_entries: int):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self._repos: "OrderedDict[Tuple[str, str], RepoContributions]" = OrderedDict()
+        self._refreshing: Dict[Tuple[str, str], "asyncio.Task[RepoContributions]"] = {}
+
+    async def _fetch(self, owner: str, repo: str) -> RepoContributions:
+        path = f"/repos/{owner}/{repo}/contributors?per_page={PER_PAGE}"
+        first = await github_get(f"{path}&page=1")
+        contributors = list(_check(first))
+
+        last = _last_page(first) if first.status_code == 200 else 1
+        if last > 1:
+            sem = asyncio.Semaphore(CONTRIBUTION_PAGE_CONCURRENCY)
+
+            async def page(n: int) -> list:
+                async with sem:
+                    return _check(await github_get(f"{path}&page={n}"))
+
+            for rows in await asyncio.gather(*(page(n) for n in range(2, last + 1))):
+                contributors.extend(rows)
+
+        by_login: Dict[str, int] = {}
+        for c in contributors:
+            login = (c.get("login") or "").lower()
+            if login:
+                by_login[login] = by_login.get(login, 0) + int(c.get("contributions", 0))
+        total = sum(int(c.get("contributions", 0)) for c in contributors)
+        return RepoContributions(by_login, total, time.time())
+
+    async def _refresh(self, key: Tuple[str, str]) -> RepoContributions:
+        try:
+            stats = await self._fetch(*key)
+            self._repos[key] = stats
+            self._repos.move_to_end(key)
+            while len(self._repos) > self.max_entries:
+                self._repos.popitem(last=False)
+            return stats
+        finally:
+            self._refreshing.pop(key, None)
+
+    def _start_refresh(self, key: Tuple[str, str]) -> "asyncio.Task[RepoContributions]":
+        task = self._refreshing.get(key)
+        if task is None:
+            task = self._refreshing[key] = asyncio.create_task(self._refresh(key))
+            # 백그라운드 갱신 실패는 다음 조회 때 재시도 (예외가 버려졌다는 경고 방지)
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    async def get(self, owner: str, repo: str) -> RepoContributions:
+        key = (owner.lower(), repo.lower())
+        entry: Optional[RepoContributions] = self._repos.get(key)
+        if entry is not None:
+            self._repos.move_to_end(key)
+        age = time.time() - entry.fetched_at if entry else None
+        if entry is not None and age < self.ttl:
+            return entry
+        if entry is not None and age < self.max_stale:
+            self._start_refresh(key)
+            return entry
+        return await asyncio.shield(self._start_refresh(key))
+
+    def user_share(self, stats: RepoContributions, username: str) -> Tuple[int, int, float]:
+        mine = stats.by_login.get(username.lower(), 0)
+        percent = (mine / stats.total * 100) if stats.total else 0
+        return mine, stats.total, round(percent, 1)
+
+
+contribution_stats = ContributionStats(
+    CONTRIBUTION_STATS_TTL, CONTRIBUTION_STATS_MAX_STALE, CONTRIBUTION_STATS_MAX_ENTRIES
+)
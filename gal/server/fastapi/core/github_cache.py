@@ -0,0 +1,102 @@
+# GitHub REST 응답 디스크 캐시 (sqlite, URL 키)
+# - TTL 안의 항목은 네트워크 없이 바로 응답
+# - TTL이 지나면 저장된 ETag로 If-None-Match 재검증 → 304는 GitHub rate limit에 포함되지 않음
+# - 오류 응답은 저장하지 않음
+import os
+import json
+import time
+import sqlite3
+import tempfile
+import threading
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from core.http_clients import github_client
+
+GITHUB_CACHE_DB = Path(os.getenv("GITHUB_CACHE_DB", str(Path(tempfile.gettempdir()) / "jobverse-github-cache.sqlite3")))
+GITHUB_CACHE_TTL = float(os.getenv("GITHUB_CACHE_TTL", "300"))  # 초, 이 안에서는 재검증도 생략
+GITHUB_CACHE_RETENTION = float(os.getenv("GITHUB_CACHE_RETENTION", str(7 * 24 * 3600)))  # 오래 안 쓴 항목 정리
+
+# 재생에 필요한 응답 헤더만 저장 (Link는 페이지네이션에 사용)
+_KEPT_HEADERS = ("etag", "link", "content-type")
+
+_lock = threading.Lock()
+_conn: Optional[sqlite3.Connection] = None
+_stats = {"fresh": 0, "revalidated": 0, "miss": 0}
+
+
+def _db() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        GITHUB_CACHE_DB.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(GITHUB_CACHE_DB), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " url TEXT PRIMARY KEY, etag TEXT, headers TEXT NOT NULL,"
+            " body BLOB NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        conn.execute("DELETE FROM responses WHERE fetched_at < ?", (time.time() - GITHUB_CACHE_RETENTION,))
+        conn.commit()
+        _conn = conn
+    return _conn
+
+def _load(url: str) -> Optional[Tuple[Optional[str], Dict[str, str], bytes, float]]:
+    with _lock:
+        row = _db().execute(
+            "SELECT etag, headers, body, fetched_at FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+    if row is None:
+        return None
+    return row[0], json.loads(row[1]), row[2], row[3]
+
+def _store(url: str, etag: Optional[str], headers: Dict[str, str], body: bytes) -> None:
+    with _lock:
+        conn = _db()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (url, etag, headers, body, fetched_at) VALUES (?, ?, ?, ?, ?)",
+            (url, etag, json.dumps(headers), body, time.time()),
+        )
+        conn.commit()
+
+def _touch(url: str) -> None:
+    with _lock:
+        conn = _db()
+        conn.execute("UPDATE responses SET fetched_at = ? WHERE url = ?", (time.time(), url))
+        conn.commit()
+
+
+def _replay(url: str, headers: Dict[str, str], body: bytes) -> httpx.Response:
+    return httpx.Response(200, headers=headers, content=body, request=httpx.Request("GET", url))
+
+async def github_get(url: str, ttl: float = GITHUB_CACHE_TTL) -> httpx.Response:
+    """
+    github_client().get(url)과 같은 용도 (url은 base_url 기준 경로 + 쿼리).
+    캐시 적중/304 재검증 시에도 200 httpx.Response를 돌려준다.
+    """
+    entry = await asyncio.to_thread(_load, url)
+    if entry is not None:
+        etag, headers, body, fetched_at = entry
+        if time.time() - fetched_at < ttl:
+            _stats["fresh"] += 1
+            return _replay(url, headers, body)
+
+    req_headers = {"If-None-Match": entry[0]} if entry is not None and entry[0] else {}
+    resp = await github_client().get(url, headers=req_headers)
+
+    if resp.status_code == 304 and entry is not None:
+        _stats["revalidated"] += 1
+        await asyncio.to_thread(_touch, url)
+        return _replay(url, entry[1], entry[2])
+
+    _stats["miss"] += 1
+    if resp.status_code == 200:
+        kept = {k: resp.headers[k] for k in _KEPT_HEADERS if k in resp.headers}
+        await asyncio.to_thread(_store, url, resp.headers.get("etag"), kept, resp.content)
+    return resp
+
+def github_cache_stats() -> Dict[str, Any]:
+    return {**_stats, "ttl": GITHUB_CACHE_TTL, "db": str(GITHUB_CACHE_DB)}
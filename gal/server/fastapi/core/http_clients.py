@@ -0,0 +1,72 @@
+# 외부 API(GitHub, OpenAI)용 공유 httpx 클라이언트
+# - 앱 lifespan에서 생성/종료 → 요청마다 TCP+TLS 핸드셰이크를 반복하지 않음
+# - HTTP/2 + keep-alive 풀: 한 연결에서 여러 요청을 다중화
+import os
+from typing import Optional
+
+import httpx
+
+GITHUB_API_URL = "https://api.github.com"
+OPENAI_API_URL = "https://api.openai.com/v1"
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() in ("1", "true", "yes")
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "50"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+
+_github: Optional[httpx.AsyncClient] = None
+_openai: Optional[httpx.AsyncClient] = None
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+
+def _new_github_client() -> httpx.AsyncClient:
+    headers = {"Authorization": f"token {GITHUB_TOKEN}"} if GITHUB_TOKEN else {}
+    return httpx.AsyncClient(
+        base_url=GITHUB_API_URL,
+        headers=headers,
+        http2=HTTP2_ENABLED,
+        limits=_limits(),
+        timeout=httpx.Timeout(15.0, connect=5.0),
+    )
+
+def _new_openai_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=OPENAI_API_URL,
+        headers={"Authorization": f"Bearer {OPENAI_API_KEY}", "Content-Type": "application/json"},
+        http2=HTTP2_ENABLED,
+        limits=_limits(),
+        timeout=httpx.Timeout(30.0, connect=5.0),
+    )
+
+
+def github_client() -> httpx.AsyncClient:
+    """lifespan 밖(스크립트 등)에서 불려도 동작하도록 필요 시 생성."""
+    global _github
+    if _github is None or _github.is_closed:
+        _github = _new_github_client()
+    return _github
+
+def openai_client() -> httpx.AsyncClient:
+    global _openai
+    if _openai is None or _openai.is_closed:
+        _openai = _new_openai_client()
+    return _openai
+
+async def start_http_clients() -> None:
+    github_client()
+    openai_client()
+
+async def close_http_clients() -> None:
+    global _github, _openai
+    for client in (_github, _openai):
+        if client is not None:
+            await client.aclose()
+    _github = _openai = None
@@ -0,0 +1,77 @@
+# 메타인지 점수 계산 엔진 (NumPy)
+# - WEIGHTS/CATEGORIES를 (문항 × 선택지 × 카테고리) 정수 텐서로 한 번 컴파일
+# - 답안 N개를 (N × 문항) 선택지 인덱스로 인코딩 → 인덱싱 + 합 한 번으로 (N × 카테고리) 점수
+# - 무응답/잘못된 선택지는 0 가중치 슬롯으로 보냄 (compute_scores와 같은 결과)
+import json
+import hashlib
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from data.metacognition_weights import WEIGHTS, CATEGORIES
+
+QUESTION_IDS: List[int] = sorted(WEIGHTS)
+# 선택지 축도 WEIGHTS에서 생성 → 표에 새 선택지가 생겨도 compute_scores와 어긋나지 않음
+CHOICES: Tuple[str, ...] = tuple(sorted({c for q in WEIGHTS.values() for c in q}))
+_Q_INDEX = {q: i for i, q in enumerate(QUESTION_IDS)}
+_C_INDEX = {c: i for i, c in enumerate(CHOICES)}
+_NO_ANSWER = len(CHOICES)  # 마지막 슬롯 = 0 가중치
+
+
+def _compile() -> np.ndarray:
+    tensor = np.zeros((len(QUESTION_IDS), len(CHOICES) + 1, len(CATEGORIES)), dtype=np.int32)
+    cat_index = {c: i for i, c in enumerate(CATEGORIES)}
+    for qi, qid in enumerate(QUESTION_IDS):
+        for choice, deltas in WEIGHTS[qid].items():
+            for cat, inc in deltas.items():
+                if cat in cat_index:
+                    tensor[qi, _C_INDEX[choice], cat_index[cat]] += int(inc)
+    return tensor
+
+WEIGHT_TENSOR = _compile()
+# 가중치 표가 바뀌면 달라지는 버전 → 저장된 결과 중 재채점 대상 판별에 사용
+WEIGHTS_VERSION = hashlib.sha256(
+    json.dumps({"weights": WEIGHTS, "categories": CATEGORIES}, sort_keys=True).encode("utf-8")
+).hexdigest()[:16]
+
+
+def _question_index(qid) -> Optional[int]:
+    try:
+        return _Q_INDEX.get(int(qid))
+    except (TypeError, ValueError):
+        return None
+
+def sanitize_answers(answers: Mapping[str, str]) -> Dict[str, str]:
+    """표에 있는 문항/선택지 쌍만 남김 (키는 "1".."10" 형태로 정규화) → 저장용."""
+    clean: Dict[str, str] = {}
+    for qid, choice in answers.items():
+        qi = _question_index(qid)
+        if qi is not None and isinstance(choice, str) and choice in _C_INDEX:
+            clean[str(QUESTION_IDS[qi])] = choice
+    return clean
+
+def encode_answers(answers: Mapping[str, str]) -> np.ndarray:
+    """{"1": "B", ...} → (문항 수,) 선택지 인덱스."""
+    codes = np.full(len(QUESTION_IDS), _NO_ANSWER, dtype=np.int8)
+    for qid, choice in answers.items():
+        qi = _question_index(qid)
+        if qi is not None and isinstance(choice, str):
+            codes[qi] = _C_INDEX.get(choice, _NO_ANSWER)
+    return codes
+
+def encode_batch(answer_sets: Iterable[Mapping[str, str]]) -> np.ndarray:
+    rows = [encode_answers(a) for a in answer_sets]
+    if not rows:
+        return np.empty((0, len(QUESTION_IDS)), dtype=np.int8)
+    return np.stack(rows)
+
+def score_codes(codes: np.ndarray) -> np.ndarray:
+    """(N × 문항) 선택지 인덱스 → (N × 카테고리) 점수."""
+    q = np.arange(len(QUESTION_IDS))
+    return WEIGHT_TENSOR[q, codes].sum(axis=1)
+
+def score_batch(answer_sets: Iterable[Mapping[str, str]]) -> np.ndarray:
+    return score_codes(encode_batch(answer_sets))
+
+def scores_to_dict(row: np.ndarray) -> Dict[str, int]:
+    return {cat: int(v) for cat, v in zip(CATEGORIES, row)}
@@ -0,0 +1,106 @@
+# README 요약 캐시
+# - 키: sha256(model + prompt) → 긴 프롬프트 문자열을 키로 들고 있지 않음
+# - 1차: 프로세스 메모리 LRU (개수 제한 + TTL)
+# - 2차: sqlite 디스크 (재시작 후에도 유지, 같은 호스트의 여러 워커가 공유)
+import os
+import time
+import sqlite3
+import hashlib
+import tempfile
+import threading
+import asyncio
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+SUMMARY_CACHE_DB = Path(os.getenv("SUMMARY_CACHE_DB", str(Path(tempfile.gettempdir()) / "jobverse-summary-cache.sqlite3")))
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "1024"))  # 메모리 LRU
+SUMMARY_CACHE_TTL = float(os.getenv("SUMMARY_CACHE_TTL", str(30 * 24 * 3600)))  # 초
+
+
+def summary_key(model: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    def __init__(self, db_path: Path, max_entries: int, ttl: float):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()  # key → (요약, 저장 시각)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                " key TEXT PRIMARY KEY, summary TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.execute("DELETE FROM summaries WHERE created_at < ?", (time.time() - self.ttl,))
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _remember(self, key: str, summary: str, created_at: float) -> None:
+        self._memory[key] = (summary, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit is not None:
+                if now - hit[1] < self.ttl:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return hit[0]
+                del self._memory[key]
+            row = self._db().execute(
+                "SELECT summary, created_at FROM summaries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] < self.ttl:
+                self._remember(key, row[0], row[1])
+                self._stats["disk_hits"] += 1
+                return row[0]
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, key: str, summary: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, summary, now)
+            conn = self._db()
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, summary, created_at) VALUES (?, ?, ?)",
+                (key, summary, now),
+            )
+            conn.commit()
+            self._stats["stores"] += 1
+
+    async def aget(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, summary: str) -> None:
+        await asyncio.to_thread(self.set, key, summary)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+            total = hits + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": round(hits / total, 3) if total else 0.0,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+            }
+
+
+summary_cache = SummaryCache(SUMMARY_CACHE_DB, SUMMARY_CACHE_MAX_ENTRIES, SUMMARY_CACHE_TTL)
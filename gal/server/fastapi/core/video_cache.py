@@ -0,0 +1,135 @@
+# GridFS 인기 영상 로컬 디스크 캐시 (바이트 예산 LRU)
+# - 일정 횟수 이상 재생된 영상만 디스크에 내려받아 FileResponse(sendfile 경로)로 서빙
+# - 파일 버전(md5 / uploadDate / length)이 바뀌면 자동 무효화
+import os
+import hashlib
+import tempfile
+import threading
+import traceback
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from bson import ObjectId
+
+from core.db import fs_videos
+
+VIDEO_CACHE_DIR = Path(os.getenv("VIDEO_CACHE_DIR", str(Path(tempfile.gettempdir()) / "jobverse-video-cache")))
+VIDEO_CACHE_MAX_BYTES = int(os.getenv("VIDEO_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))  # 기본 2GB
+VIDEO_CACHE_MIN_HITS = int(os.getenv("VIDEO_CACHE_MIN_HITS", "2"))  # 재생 시작 횟수 기준, 이 횟수부터 디스크에 적재
+
+# 디스크 적재 전용 스레드 (수 GB 복사가 시청자 청크 읽기용 gridfs-io 풀을 점유하지 않도록 1개)
+_materialize_io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="video-cache")
+
+
+def file_version(grid_out) -> str:
+    """GridFS 파일 문서 기준 버전 문자열 (내용이 바뀌면 달라짐)."""
+    md5 = getattr(grid_out, "md5", None)
+    upload_date = grid_out.upload_date
+    return f"{md5 or ''}:{upload_date.isoformat() if upload_date else ''}:{grid_out.length}"
+
+
+class VideoDiskCache:
+    def __init__(self, directory: Path, max_bytes: int, min_hits: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.min_hits = min_hits
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Path, int]]" = OrderedDict()  # file_id → (경로, 크기), LRU 순
+        self._total = 0
+        self._hits: Counter = Counter()
+        self._in_progress: Dict[str, Future] = {}  # file_id → 적재 작업
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._load_existing()
+
+    # 파일명: {file_id}-{버전 해시}.bin → 프로세스 재시작/다른 워커와도 공유
+    def _path(self, file_id: str, version: str) -> Path:
+        vhash = hashlib.sha1(version.encode("utf-8")).hexdigest()[:16]
+        return self.directory / f"{file_id}-{vhash}.bin"
+
+    def _load_existing(self) -> None:
+        files = sorted(self.directory.glob("*.bin"), key=lambda p: p.stat().st_atime)
+        for p in files:
+            file_id = p.stem.split("-", 1)[0]
+            size = p.stat().st_size
+            self._entries[file_id] = (p, size)
+            self._total += size
+        self._evict()
+
+    def _drop(self, file_id: str) -> None:
+        path, size = self._entries.pop(file_id)
+        self._total -= size
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        while self._total > self.max_bytes and self._entries:
+            self._drop(next(iter(self._entries)))
+
+    def lookup(self, file_id: str, version: str) -> Optional[Path]:
+        """현재 버전의 캐시 파일 경로. 이전 버전이 남아 있으면 무효화."""
+        path = self._path(file_id, version)
+        with self._lock:
+            entry = self._entries.get(file_id)
+            if entry and entry[0] != path:
+                self._drop(file_id)
+                entry = None
+            if entry is None and path.exists():  # 다른 워커가 적재한 파일
+                size = path.stat().st_size
+                self._entries[file_id] = (path, size)
+                self._total += size
+                entry = self._entries[file_id]
+            if entry is None:
+                return None
+            self._entries.move_to_end(file_id)
+            return entry[0]
+
+    def record_play(self, file_id: str, version: str, size: int) -> None:
+        """
+        재생 시작 1회를 세고, 기준 횟수에 도달하면 백그라운드 적재를 예약한다.
+        호출 측은 Range 이어받기 요청이 아니라 재생 시작(전체 또는 bytes=0-)일 때만 부른다.
+        """
+        with self._lock:
+            self._hits[file_id] += 1
+            if self._hits[file_id] < self.min_hits or size > self.max_bytes or file_id in self._in_progress:
+                return
+            future = _materialize_io.submit(self.materialize, file_id, version)
+            self._in_progress[file_id] = future
+        future.add_done_callback(lambda f: self._finish(file_id, f))
+
+    def _finish(self, file_id: str, future: Future) -> None:
+        with self._lock:
+            if self._in_progress.get(file_id) is future:
+                del self._in_progress[file_id]
+
+    def materialize(self, file_id: str, version: str) -> None:
+        """GridFS → 임시 파일 → 원자적 rename. 전용 I/O 스레드에서 호출."""
+        path = self._path(file_id, version)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            grid_out = fs_videos.get(ObjectId(file_id))
+            if file_version(grid_out) != version:
+                return  # 그 사이 교체됨 → 다음 재생 때 새 버전으로
+            with open(tmp, "wb") as f:
+                for chunk in iter(lambda: grid_out.read(grid_out.chunk_size), b""):
+                    f.write(chunk)
+            os.replace(tmp, path)
+            size = path.stat().st_size
+            with self._lock:
+                if file_id in self._entries:
+                    self._drop(file_id)
+                self._entries[file_id] = (path, size)
+                self._total += size
+                self._evict()
+        except Exception:
+            traceback.print_exc()
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+
+video_cache = VideoDiskCache(VIDEO_CACHE_DIR, VIDEO_CACHE_MAX_BYTES, VIDEO_CACHE_MIN_HITS)
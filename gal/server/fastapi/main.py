@@ -1,13 +1,31 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from core.http_clients import start_http_clients, close_http_clients
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # GitHub/OpenAI 공유 HTTP/2 클라이언트 (연결 풀 재사용)
+    await start_http_clients()
+    # 만료된 영상 업로드 세션/청크 정리
+    sweeper = asyncio.create_task(video.run_upload_sweeper())
+    yield
+    sweeper.cancel()
+    await close_http_clients()
+
+
 app = FastAPI(
     title="My Project API",
     description="GitHub, OpenAI, Video Streaming 기능을 제공하는 API",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -44,3 +44,10 @@ class MetacognitionResult(BaseModel):
 class AnalysisResponse(BaseModel):
     scores: MetacognitionScores
     ai_advice: str
+
+# 재개 가능한 영상 업로드 세션 생성 요청
+class VideoUploadInit(BaseModel):
+    filename: str
+    content_type: str = "video/mp4"
+    length: int = Field(gt=0)
+    sha256: Optional[str] = None  # 클라이언트가 미리 계산했다면 업로드 전에 중복 확인
@@ -0,0 +1,80 @@
+# 가중치 표 변경 후 저장된 메타인지 결과 일괄 재채점
+#   python rescore_metacognition.py [--batch-size 10000] [--all] [--dry-run]
+# - weights_version이 현재와 다른 결과만 대상 (--all이면 전체)
+# - 답안은 NumPy 엔진으로 배치 단위 채점, bulk_write로 반영
+# - 새 점수 벡터의 조언이 캐시(metacognition_advice)에 있으면 함께 교체,
+#   없으면 새 점수 기준 기본 코멘트로 바꾸고 advice_stale로 표시
+#   (warm_metacognition_advice.py로 캐시를 채운 뒤 --all로 다시 돌리면 교체됨)
+import argparse
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from pymongo import UpdateOne  # noqa: E402
+
+from core.db import mongo_db  # noqa: E402
+from core.metacognition_engine import WEIGHTS_VERSION, score_batch, scores_to_dict  # noqa: E402
+from routers.metacognition import AI_MODEL, advice_cache, advice_cache_key, fallback_advice  # noqa: E402
+
+results = mongo_db.metacognition_results
+
+
+def _cached_advice(score_dicts: List[Dict[str, int]]) -> Dict[str, str]:
+    keys = list({advice_cache_key(s) for s in score_dicts})
+    return {d["_id"]: d["advice"] for d in advice_cache.find({"_id": {"$in": keys}}, {"advice": 1})}
+
+def _flush(docs: List[dict], dry_run: bool) -> Tuple[int, int]:
+    score_dicts = [scores_to_dict(row) for row in score_batch(d["answers"] for d in docs)]
+    advice = _cached_advice(score_dicts)
+    now = datetime.utcnow()
+    ops = []
+    stale = 0
+    for doc, scores in zip(docs, score_dicts):
+        update = {"scores": scores, "weights_version": WEIGHTS_VERSION, "rescored_at": now}
+        cached = advice.get(advice_cache_key(scores))
+        if cached is not None:
+            update.update({"ai_advice": cached, "advice_stale": False, "ai_meta.model": AI_MODEL, "ai_meta.cached": True})
+        else:
+            stale += 1
+            # 이전 점수로 쓴 조언을 남기지 않음 → 새 점수 기준 기본 코멘트 + 재생성 대상 표시
+            update.update({"ai_advice": fallback_advice(scores), "advice_stale": True, "ai_meta.model": "fallback", "ai_meta.cached": False})
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": update}))
+    if ops and not dry_run:
+        results.bulk_write(ops, ordered=False)
+    return len(ops), stale
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="메타인지 결과 재채점")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--all", action="store_true", help="버전이 같아도 모두 재채점")
+    parser.add_argument("--dry-run", action="store_true", help="계산만 하고 쓰지 않음")
+    args = parser.parse_args()
+
+    query: dict = {"answers": {"$exists": True}}
+    if not args.all:
+        query["weights_version"] = {"$ne": WEIGHTS_VERSION}
+    skipped = results.count_documents({"answers": {"$exists": False}})
+
+    total = stale = 0
+    batch: List[dict] = []
+    for doc in results.find(query, {"answers": 1}).batch_size(args.batch_size):
+        batch.append(doc)
+        if len(batch) >= args.batch_size:
+            n, s = _flush(batch, args.dry_run)
+            total, stale = total + n, stale + s
+            batch = []
+            print(f"  ... {total}건")
+    if batch:
+        n, s = _flush(batch, args.dry_run)
+        total, stale = total + n, stale + s
+
+    action = "계산" if args.dry_run else "갱신"
+    print(f"가중치 버전 {WEIGHTS_VERSION}: {total}건 {action} (캐시 조언 없음 {stale}건은 advice_stale), 답안 없는 결과 {skipped}건 제외")
+
+
+if __name__ == "__main__":
+    main()
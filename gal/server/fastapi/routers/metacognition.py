@@ -1,45 +1,24 @@
 import os
 import time
+import asyncio
+import hashlib
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, Body, Depends, Query
+from fastapi import APIRouter, Body, Depends, Query
 from bson import ObjectId
-from jose import jwt, JWTError
-from fastapi.security import OAuth2PasswordBearer
 import httpx
 
 from core.db import mongo_db
+from core.auth import require_user_id
 from models import MetacognitionAnswers, MetacognitionScores, AnalysisResponse
 from data.metacognition_weights import WEIGHTS, CATEGORIES  # ✅ 공식 가중치/카테고리
+from core.metacognition_engine import WEIGHTS_VERSION, sanitize_answers
 
 router = APIRouter(prefix="/metacognition", tags=["Metacognition Test"])
 
-# ---------- JWT ----------
-SECRET_KEY = os.getenv("JWT_SECRET_KEY")
-ALGORITHM = "HS256"
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
-
-async def get_current_user_id(token: str = Depends(oauth2_scheme)) -> str:
-    """
-    JWT 토큰에서 사용자 ObjectId 문자열 추출({_id}).
-    """
-    if not SECRET_KEY:
-        raise HTTPException(status_code=500, detail="JWT_SECRET_KEY is not set on the server.")
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: Optional[str] = payload.get("_id")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token payload")
-        try:
-            _ = ObjectId(user_id)
-        except Exception:
-            raise HTTPException(status_code=401, detail="Invalid user id in token")
-        return user_id
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Could not validate credentials")
-
 # ---------- 점수 계산 (정수 가중치 누적) ----------
+# 요청 1건용. 대량 재채점은 core/metacognition_engine.py(NumPy 배치)를 사용
 def compute_scores(answers: Dict[str, str]) -> Dict[str, int]:
     scores = {k: 0 for k in CATEGORIES}
     for qid_str, choice_key in answers.items():
@@ -58,15 +37,19 @@ AI_ENABLED = os.getenv("AI_ANALYSIS_ENABLED", "true").lower() in ("1", "true", "
 AI_MODEL = os.getenv("AI_MODEL", "gpt-4o-mini")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-# ENV로도 제어 가능: 비어있거나 "none"이면 무제한 대기
+# ENV로 제어: 기본 20초, "none"이면 무제한 대기
+# (조언은 점수 벡터 캐시에서 대부분 바로 나오므로 미스 시에도 오래 붙잡지 않음)
+AI_TIMEOUT_FALLBACK = 20.0
 _env_timeout = os.getenv("AI_TIMEOUT_SECONDS", "").strip().lower()
-if _env_timeout in ("", "none"):
-    AI_TIMEOUT_DEFAULT: Optional[float] = None  # ← 기본 무제한
+if _env_timeout == "none":
+    AI_TIMEOUT_DEFAULT: Optional[float] = None
+elif _env_timeout == "":
+    AI_TIMEOUT_DEFAULT = AI_TIMEOUT_FALLBACK
 else:
     try:
         AI_TIMEOUT_DEFAULT = float(_env_timeout)
     except Exception:
-        AI_TIMEOUT_DEFAULT = None  # 파싱 실패 시 무제한
+        AI_TIMEOUT_DEFAULT = AI_TIMEOUT_FALLBACK  # 파싱 실패 시 기본값
 
 def build_prompt(scores: Dict[str, int]) -> str:
     pretty = "\n".join([f"- {k}: {v}" for k, v in scores.items()])
@@ -141,27 +124,62 @@ async def try_llm_advice(
     except Exception:
         return None  # 타임아웃/네트워크/HTTP 에러 등
 
+# ---------- 점수 벡터별 조언 캐시 ----------
+# 프롬프트는 5개 카테고리 점수로만 결정됨 → (모델, 프롬프트) 해시를 _id로 조언을 영구 보관.
+# 도달 가능한 점수 벡터는 많지 않아 warm_metacognition_advice.py로 미리 채워 둘 수 있다.
+advice_cache = mongo_db.metacognition_advice
+
+def score_vector(scores: Dict[str, int]) -> Tuple[int, ...]:
+    return tuple(int(scores.get(k, 0)) for k in CATEGORIES)
+
+def advice_cache_key(scores: Dict[str, int], model: str = AI_MODEL) -> str:
+    return hashlib.sha256(f"{model}\0{build_prompt(scores)}".encode("utf-8")).hexdigest()
+
+def get_cached_advice(scores: Dict[str, int]) -> Optional[str]:
+    doc = advice_cache.find_one({"_id": advice_cache_key(scores)}, {"advice": 1})
+    return doc["advice"] if doc else None
+
+def store_advice(scores: Dict[str, int], advice: str) -> None:
+    advice_cache.update_one(
+        {"_id": advice_cache_key(scores)},
+        {"$set": {
+            "scores": list(score_vector(scores)),
+            "model": AI_MODEL,
+            "advice": advice,
+            "updated_at": datetime.utcnow(),
+        }},
+        upsert=True,
+    )
+
 # 사용자별 1개 문서만 유지되도록 unique 인덱스
 try:
     mongo_db.metacognition_results.create_index("user_id", unique=True)
+    advice_cache.create_index("scores")
 except Exception:
     pass
 
 @router.post("/analyze", response_model=AnalysisResponse)
 async def analyze_metacognition(
     payload: MetacognitionAnswers = Body(...),
-    current_user_id: str = Depends(get_current_user_id),
-    # 쿼리로 요청별 타임아웃 제어: 기본 None(무제한 대기)
+    current_user_id: str = Depends(require_user_id),
+    # 쿼리로 요청별 타임아웃 제어: 기본 AI_TIMEOUT_SECONDS(20초)
     timeout_seconds: Optional[float] = Query(
         default=AI_TIMEOUT_DEFAULT,
-        description="OpenAI 호출 타임아웃(초). 비우거나 'none'이면 무제한 대기.",
+        description="OpenAI 호출 타임아웃(초). 캐시 미스일 때만 사용.",
     ),
 ):
     # 1) 점수 계산 (정수 가중치 누적)
     scores_dict = compute_scores(payload.answers)
 
-    # 2) AI 분석 — 기본은 무제한 대기. 에러나 예외 시 폴백.
-    ai_advice = await try_llm_advice(scores_dict, payload.answers, timeout_seconds)
+    # 2) AI 분석 — 같은 점수 벡터의 조언이 캐시에 있으면 바로 사용, 없으면 호출 후 저장.
+    #    에러/타임아웃 시 폴백 (폴백은 캐시하지 않음)
+    ai_advice = await asyncio.to_thread(get_cached_advice, scores_dict) if AI_ENABLED else None
+    cached = ai_advice is not None
+    if not cached:
+        ai_advice = await try_llm_advice(scores_dict, payload.answers, timeout_seconds)
+        if ai_advice:
+            await asyncio.to_thread(store_advice, scores_dict, ai_advice)
+    used_model = bool(ai_advice)
     if not ai_advice:
         ai_advice = fallback_advice(scores_dict)
 
@@ -172,11 +190,16 @@ async def analyze_metacognition(
         {
             "$set": {
                 "scores": scores_dict,
+                # 가중치 표가 바뀌면 rescore_metacognition.py로 재채점할 수 있도록 원답안 보관
+                "answers": sanitize_answers(payload.answers),  # 표에 있는 문항/선택지만
+                "weights_version": WEIGHTS_VERSION,
                 "ai_advice": ai_advice,
+                "advice_stale": False,  # 재채점 후 조언이 없던 결과도 재분석 시 해제
                 "updated_at": now,
                 "ai_meta": {
-                    "model": AI_MODEL if (ai_advice and AI_ENABLED) else "fallback",
+                    "model": AI_MODEL if (used_model and AI_ENABLED) else "fallback",
                     "ai_enabled": AI_ENABLED,
+                    "cached": cached,
                     "timeout_seconds": timeout_seconds,  # None이면 무제한
                 },
             },
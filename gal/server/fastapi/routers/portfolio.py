@@ -1,69 +1,128 @@
 import os
 import re
+import json
 import base64
 import asyncio
 import markdown
-from functools import lru_cache
+from collections import OrderedDict
+from typing import Dict, Optional
 
-from fastapi import APIRouter, HTTPException, status, Depends, Request 
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-import httpx
 
-router = APIRouter(prefix="/portfolio", tags=["Portfolio (GitHub & OpenAI)"])
+from core.http_clients import openai_client
+from core.github_cache import github_get
+from core.summary_cache import summary_cache, summary_key
+from core.contribution_stats import contribution_stats
 
-# --- 환경변수 및 설정 ---
-GITHUB_API_URL = "https://api.github.com"
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+router = APIRouter(prefix="/portfolio", tags=["Portfolio (GitHub & OpenAI)"])
 
 
 # --- GitHub 관련 API ---
-
-def github_headers():
-    return {"Authorization": f"token {GITHUB_TOKEN}"} if GITHUB_TOKEN else {}
+# 인증 헤더/기본 URL은 공유 클라이언트(core/http_clients.py)에 설정되어 있음
+# 응답은 ETag 재검증 디스크 캐시(core/github_cache.py)를 거침
 
 @router.get("/repos/{username}")
 async def get_repos(username: str):
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(f"{GITHUB_API_URL}/users/{username}/repos", headers=github_headers())
-        if resp.status_code != 200:
-            raise HTTPException(status_code=resp.status_code, detail="Failed to fetch repos")
-        return resp.json()
+    resp = await github_get(f"/users/{username}/repos")
+    if resp.status_code != 200:
+        raise HTTPException(status_code=resp.status_code, detail="Failed to fetch repos")
+    return resp.json()
 
 @router.get("/repos/{username}/{repo}/languages")
 async def get_languages(username: str, repo: str):
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(f"{GITHUB_API_URL}/repos/{username}/{repo}/languages", headers=github_headers())
-        if resp.status_code != 200:
-            raise HTTPException(status_code=resp.status_code, detail="Failed to fetch languages")
-        return resp.json()
+    resp = await github_get(f"/repos/{username}/{repo}/languages")
+    if resp.status_code != 200:
+        raise HTTPException(status_code=resp.status_code, detail="Failed to fetch languages")
+    return resp.json()
+
+# README 렌더링 결과 캐시: blob sha가 같으면 내용도 같으므로 리비전당 한 번만 렌더링
+README_CACHE_MAX_ENTRIES = int(os.getenv("README_CACHE_MAX_ENTRIES", "512"))
+# 이 크기(base64 길이) 이상의 README는 워커 스레드에서 렌더링 → 이벤트 루프를 막지 않음
+README_THREAD_THRESHOLD = int(os.getenv("README_THREAD_THRESHOLD", "16384"))
+_readme_cache: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+
+def _render_markdown(content_b64: str) -> Dict[str, str]:
+    decoded_markdown = base64.b64decode(content_b64).decode('utf-8', errors="replace")
+    html = markdown.markdown(decoded_markdown, extensions=['fenced_code', 'tables', 'toc', 'nl2br'])
+    return {"readme_html": html, "readme_markdown": decoded_markdown}
+
+async def render_readme(sha: Optional[str], content_b64: str) -> Dict[str, str]:
+    if sha and sha in _readme_cache:
+        _readme_cache.move_to_end(sha)
+        return _readme_cache[sha]
+    if len(content_b64) >= README_THREAD_THRESHOLD:
+        rendered = await asyncio.to_thread(_render_markdown, content_b64)
+    else:
+        rendered = _render_markdown(content_b64)
+    if sha:
+        _readme_cache[sha] = rendered
+        while len(_readme_cache) > README_CACHE_MAX_ENTRIES:
+            _readme_cache.popitem(last=False)
+    return rendered
 
 @router.get("/repos/{username}/{repo}/readme")
 async def get_readme(username: str, repo: str):
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(f"{GITHUB_API_URL}/repos/{username}/{repo}/readme", headers=github_headers())
-        if resp.status_code != 200:
-            raise HTTPException(status_code=resp.status_code, detail="Failed to fetch readme")
-        data = resp.json()
-        content = data.get("content")
-        if content:
-            decoded_markdown = base64.b64decode(content).decode('utf-8', errors="replace")
-            html = markdown.markdown(decoded_markdown, extensions=['fenced_code', 'tables', 'toc', 'nl2br'])
-            return {"readme_html": html, "readme_markdown": decoded_markdown}
-        return {"readme_html": "", "readme_markdown": ""}
+    resp = await github_get(f"/repos/{username}/{repo}/readme")
+    if resp.status_code != 200:
+        raise HTTPException(status_code=resp.status_code, detail="Failed to fetch readme")
+    data = resp.json()
+    content = data.get("content")
+    if content:
+        return await render_readme(data.get("sha"), content)
+    return {"readme_html": "", "readme_markdown": ""}
 
 @router.get("/repos/{owner}/{repo}/contributions/{username}")
 async def get_repo_contribution(owner: str, repo: str, username: str):
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(f"{GITHUB_API_URL}/repos/{owner}/{repo}/contributors", headers=github_headers())
-        if resp.status_code != 200:
-            raise HTTPException(status_code=resp.status_code, detail="Failed to fetch contributors")
-        data = resp.json()
-        total = sum(c["contributions"] for c in data)
-        user_commit = next((c["contributions"] for c in data if c["login"].lower() == username.lower()), 0)
-        percent = (user_commit / total * 100) if total else 0
-        return { "my_commit": user_commit, "total_commit": total, "contribution_percent": round(percent, 1) }
+    # 전체 contributors 페이지 기준 집계를 레포 단위로 캐시 (core/contribution_stats.py)
+    stats = await contribution_stats.get(owner, repo)
+    user_commit, total, percent = contribution_stats.user_share(stats, username)
+    return { "my_commit": user_commit, "total_commit": total, "contribution_percent": percent }
+
+
+# --- 포트폴리오 스냅샷 (레포 목록 + 레포별 언어/README/기여도를 한 번에) ---
+# 브라우저가 레포마다 3번씩 왕복하던 것을 서버에서 제한된 동시성으로 팬아웃.
+# 일부 호출이 실패해도 나머지는 채워서 반환하고, 실패 항목은 errors에 기록.
+SNAPSHOT_CONCURRENCY = int(os.getenv("PORTFOLIO_SNAPSHOT_CONCURRENCY", "8"))
+
+async def _guarded(sem: asyncio.Semaphore, coro):
+    async with sem:
+        return await coro
+
+def _error_detail(e: Exception) -> str:
+    if isinstance(e, HTTPException):
+        return f"{e.status_code}: {e.detail}"
+    return f"{type(e).__name__}: {e}"
+
+@router.get("/snapshot/{username}")
+async def get_portfolio_snapshot(username: str):
+    repos = await get_repos(username)  # 목록 실패는 전체 실패
+    sem = asyncio.Semaphore(SNAPSHOT_CONCURRENCY)
+
+    async def one(repo: dict) -> dict:
+        name = repo["name"]
+        owner = (repo.get("owner") or {}).get("login") or username
+        parts = {
+            "languages": get_languages(owner, name),
+            "readme": get_readme(owner, name),
+            "contribution": get_repo_contribution(owner, name, username),
+        }
+        results = await asyncio.gather(
+            *(_guarded(sem, c) for c in parts.values()), return_exceptions=True
+        )
+        item: dict = {"repo": repo, "errors": {}}
+        for key, result in zip(parts, results):
+            if isinstance(result, Exception):
+                item[key] = None
+                item["errors"][key] = _error_detail(result)
+            else:
+                item[key] = result
+        return item
+
+    items = await asyncio.gather(*(one(r) for r in repos))
+    failed = sum(1 for i in items if i["errors"])
+    return {"username": username, "repos": items, "partial": failed > 0}
 
 
 # --- OpenAI 요약 관련 API ---
@@ -80,22 +139,18 @@ def remove_images_from_markdown(text: str) -> str:
     text = re.sub(r'<img\s[^>]*>', '', text, flags=re.IGNORECASE | re.MULTILINE)
     return text
 
-@lru_cache(maxsize=256)
-def prompt_to_key(prompt: str) -> str:
-    return prompt
+SUMMARY_MODEL = os.getenv("PORTFOLIO_SUMMARY_MODEL", "gpt-3.5-turbo")
+EMPTY_README_SUMMARY = "리드미에 내용이 없습니다."
 
 async def call_openai_api(prompt: str) -> str:
-    url = "https://api.openai.com/v1/chat/completions"
-    headers = { "Authorization": f"Bearer {OPENAI_API_KEY}", "Content-Type": "application/json" }
     body = {
-        "model": "gpt-3.5-turbo",
+        "model": SUMMARY_MODEL,
         "messages": [{"role": "user", "content": prompt}],
         "max_tokens": 400, "temperature": 0.5,
     }
-    async with httpx.AsyncClient(timeout=30) as client:
-        response = await client.post(url, headers=headers, json=body)
-        response.raise_for_status()
-        return response.json()["choices"][0]["message"]["content"].strip()
+    response = await openai_client().post("/chat/completions", json=body)
+    response.raise_for_status()
+    return response.json()["choices"][0]["message"]["content"].strip()
 
 PROMPT_TEMPLATE = """
 아래는 GitHub 저장소의 README.md 내용입니다.
@@ -113,54 +168,116 @@ PROMPT_TEMPLATE = """
 {readme}
 """
 
-@router.post("/openai-summary/")
-async def get_summary(payload: SummaryRequest, request: Request): 
-    app_state = request.app.state 
-    readme = payload.readme or ""
-    if not hasattr(app_state, "summary_cache"): app_state.summary_cache = {}
-    
+def is_empty_readme(readme: str) -> bool:
     lines = [line.strip() for line in readme.strip().splitlines() if line.strip()]
-    if not readme.strip() or (len(lines) <= 2 and sum(len(l) for l in lines) < 100):
-        return {"summary": "리드미에 내용이 없습니다."}
+    return not readme.strip() or (len(lines) <= 2 and sum(len(l) for l in lines) < 100)
 
-    prompt = PROMPT_TEMPLATE.format(github_url=payload.github_url, readme=readme[:2000])
-    cache_key = prompt_to_key(prompt)
-    if cache_key in app_state.summary_cache: return {"summary": app_state.summary_cache[cache_key]}
-    
+def build_summary_prompt(repo: SummaryRequest) -> str:
+    return PROMPT_TEMPLATE.format(github_url=repo.github_url, readme=(repo.readme or "")[:2000])
+
+# 동시에 OpenAI로 나가는 요약 요청 수 제한 (큰 배치로 rate limit에 걸리지 않도록)
+OPENAI_SUMMARY_CONCURRENCY = int(os.getenv("OPENAI_SUMMARY_CONCURRENCY", "4"))
+_openai_slots = asyncio.Semaphore(OPENAI_SUMMARY_CONCURRENCY)
+# single-flight: 같은 키의 요약은 진행 중인 작업 하나를 함께 기다림 (배치 내/요청 간 공통)
+_inflight: Dict[str, "asyncio.Task[str]"] = {}
+
+async def _generate_summary(key: str, prompt: str) -> str:
+    try:
+        async with _openai_slots:
+            summary = remove_images_from_markdown(await call_openai_api(prompt))
+        await summary_cache.aset(key, summary)
+        return summary
+    finally:
+        _inflight.pop(key, None)
+
+def _join_or_start(key: str, prompt: str) -> "asyncio.Task[str]":
+    task = _inflight.get(key)
+    if task is None:
+        task = _inflight[key] = asyncio.create_task(_generate_summary(key, prompt))
+    return task
+
+async def summarize(prompt: str) -> str:
+    """캐시(메모리 LRU → sqlite) 조회 후 없으면 OpenAI 호출, 이미지 제거본을 저장."""
+    key = summary_key(SUMMARY_MODEL, prompt)
+    if key not in _inflight:
+        cached = await summary_cache.aget(key)
+        if cached is not None:
+            return cached
+    # 캐시 조회 중 다른 요청이 먼저 시작했으면 그 작업에 합류.
+    # 한 요청이 끊겨도 같은 요약을 기다리는 다른 요청은 계속 진행
+    return await asyncio.shield(_join_or_start(key, prompt))
+
+@router.post("/openai-summary/")
+async def get_summary(payload: SummaryRequest):
+    if is_empty_readme(payload.readme or ""):
+        return {"summary": EMPTY_README_SUMMARY}
     try:
-        summary = await call_openai_api(prompt)
-        cleaned = remove_images_from_markdown(summary)
-        app_state.summary_cache[cache_key] = cleaned
-        return {"summary": cleaned}
+        return {"summary": await summarize(build_summary_prompt(payload))}
     except Exception as e:
         return JSONResponse(status_code=500, content={"summary": f"오류 발생: {str(e)}"})
 
 @router.post("/openai-summaries/")
-async def get_summaries(payload: ReposSummaryRequest, request: Request): 
-    app_state = request.app.state 
-    if not hasattr(app_state, "summary_cache"): app_state.summary_cache = {}
-    
-    tasks = []
-    for repo_data in payload.repos:
-        readme = repo_data.readme or ""
-        lines = [line.strip() for line in readme.strip().splitlines() if line.strip()]
-        if not readme.strip() or (len(lines) <= 2 and sum(len(l) for l in lines) < 100):
-            tasks.append(asyncio.sleep(0, result="리드미에 내용이 없습니다."))
-            continue
-
-        prompt = PROMPT_TEMPLATE.format(github_url=repo_data.github_url, readme=readme[:2000])
-        cache_key = prompt_to_key(prompt)
-        if cache_key in app_state.summary_cache:
-            tasks.append(asyncio.sleep(0, result=app_state.summary_cache[cache_key]))
-        else:
-            tasks.append(call_openai_api(prompt))
-
+async def get_summaries(payload: ReposSummaryRequest):
+    tasks = [
+        asyncio.sleep(0, result=EMPTY_README_SUMMARY) if is_empty_readme(r.readme or "")
+        else summarize(build_summary_prompt(r))
+        for r in payload.repos
+    ]
     results = await asyncio.gather(*tasks, return_exceptions=True)
-    
-    for idx, result in enumerate(results):
-        if not isinstance(result, Exception):
-            prompt = PROMPT_TEMPLATE.format(github_url=payload.repos[idx].github_url, readme=payload.repos[idx].readme[:2000])
-            cache_key = prompt_to_key(prompt)
-            app_state.summary_cache[cache_key] = remove_images_from_markdown(result)
-
-    return { "summaries": [remove_images_from_markdown(r) if not isinstance(r, Exception) else f"오류 발생: {r}" for r in results] }
\ No newline at end of file
+    return { "summaries": [f"오류 발생: {r}" if isinstance(r, Exception) else r for r in results] }
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@router.post("/openai-summaries/stream")
+async def stream_summaries(payload: ReposSummaryRequest):
+    """
+    SSE: 레포별 요약을 끝나는 순서대로 전송 (index = 요청 내 위치).
+    빈 README/캐시 적중분을 먼저 즉시 보내고, 나머지는 완료될 때마다 보낸다.
+      event: summary  data: {"index", "summary", "cached"}  (cached: 요약 캐시 적중 여부, 빈 README는 false)
+      event: error    data: {"index", "error"}
+      event: done     data: {"count"}
+    """
+    async def events():
+        pending = []  # (index, key, prompt)
+        for i, repo in enumerate(payload.repos):
+            if is_empty_readme(repo.readme or ""):
+                yield _sse("summary", {"index": i, "summary": EMPTY_README_SUMMARY, "cached": False})
+                continue
+            prompt = build_summary_prompt(repo)
+            key = summary_key(SUMMARY_MODEL, prompt)
+            cached = None if key in _inflight else await summary_cache.aget(key)
+            if cached is not None:
+                yield _sse("summary", {"index": i, "summary": cached, "cached": True})
+            else:
+                pending.append((i, key, prompt))
+
+        async def indexed(i: int, key: str, prompt: str):
+            try:
+                return i, await asyncio.shield(_join_or_start(key, prompt)), None
+            except Exception as e:
+                return i, None, e
+
+        waiters = [asyncio.create_task(indexed(*p)) for p in pending]
+        try:
+            for done in asyncio.as_completed(waiters):
+                i, summary, error = await done
+                if error is not None:
+                    yield _sse("error", {"index": i, "error": f"오류 발생: {error}"})
+                else:
+                    yield _sse("summary", {"index": i, "summary": summary, "cached": False})
+            yield _sse("done", {"count": len(payload.repos)})
+        finally:
+            # 클라이언트가 끊기면 대기만 취소 (공유 작업은 shield로 계속 진행되어 캐시에 저장됨)
+            for w in waiters:
+                w.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/summary-cache/stats")
+async def get_summary_cache_stats():
+    return summary_cache.stats()
@@ -5,12 +5,13 @@ from pymongo import MongoClient, ReturnDocument
 from bson import ObjectId
 from bson.errors import InvalidId
 from datetime import datetime
-from jose import jwt, JWTError
 from collections import Counter
 import os
 from dotenv import load_dotenv
 from typing import Dict, Any, List
 
+from core.auth import user_id_from_request  # 공용 JWT 검증 (토큰 캐시)
+
 load_dotenv()
 
 router = APIRouter(prefix="/resume", tags=["resume"])
@@ -20,10 +21,8 @@ MONGO_URI = os.getenv("MONGO_URI")
 if not MONGO_URI:
     raise RuntimeError(".env에 MONGO_URI가 없습니다.")
 
-JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY") or os.getenv("SECRET_KEY")
-if not JWT_SECRET_KEY:
+if not (os.getenv("JWT_SECRET_KEY") or os.getenv("SECRET_KEY")):
     raise RuntimeError(".env에 JWT_SECRET_KEY(또는 SECRET_KEY)이 없습니다.")
-JWT_ALG = os.getenv("JWT_ALGORITHM", "HS256")
 
 client = MongoClient(MONGO_URI)
 db = client.get_default_database()  # ex) mongodb://localhost:27017/mydb
@@ -34,23 +33,6 @@ CUSTOM_ENCODERS = {
     datetime: lambda dt: dt.isoformat(),
 }
 
-# === 유틸: 토큰에서 user_id 꺼내기 ===
-def get_current_user_id(request: Request) -> str:
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="인증 토큰이 없습니다.")
-    token = auth_header.split(" ", 1)[1]
-
-    try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALG])
-    except JWTError:
-        raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다.")
-
-    user_id = payload.get("_id") or payload.get("user_id")
-    if not user_id:
-        raise HTTPException(status_code=401, detail="토큰에 사용자 식별자가 없습니다.")
-    return user_id
-
 # === 유틸: user 필드로 프로필 조회 ===
 def find_profile_by_user_id(user_id: str, include_photo: bool = True) -> dict | None:
     projections = None if include_photo else {"photo": 0}
@@ -88,7 +70,7 @@ def get_my_profile(
     request: Request,
     include_photo: bool = Query(True, description="사진(base64) 포함 여부")
 ):
-    user_id = get_current_user_id(request)
+    user_id = user_id_from_request(request)
     try:
         doc = find_profile_by_user_id(user_id, include_photo=include_photo)
         if not doc:
@@ -214,7 +196,7 @@ def _collect_stats_from_profiles(profiles: List[Dict[str, Any]]) -> Dict[str, An
 @router.put("/submit")
 def submit_and_get_stats(request: Request, body: Dict[str, Any]):
 
-    user_id = get_current_user_id(request)
+    user_id = user_id_from_request(request)
 
     # --- 1) 저장(업서트) ---
     job_title = _safe_str(body.get("jobTitle") or body.get("role"))
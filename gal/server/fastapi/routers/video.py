@@ -1,27 +1,494 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
-from bson import ObjectId
-from core.db import fs_videos
+import os
+import asyncio
+import base64
+import hashlib
+import traceback
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+import gridfs
+from fastapi import APIRouter, HTTPException, Header, Request, Query, Depends
+from fastapi.responses import StreamingResponse, Response, FileResponse
+from starlette.requests import ClientDisconnect
+from bson import ObjectId, Binary
+from pymongo.errors import DuplicateKeyError
+from core.db import fs_videos, mongo_db
+from core.auth import require_user_id
+from common.http_range import parse_range  # core.auth가 저장소 루트를 sys.path에 추가
+from models import VideoUploadInit
+from core.video_cache import video_cache, file_version
 
 router = APIRouter(
     prefix="/video",
     tags=["Video Streaming"],
 )
 
-def iterfile(grid_out, chunk_size=1024 * 1024):
-    while True:
-        chunk = grid_out.read(chunk_size)
+# GridFS(pymongo) 블로킹 읽기 전용 스레드 풀 → 요청 처리용 기본 스레드풀을 점유하지 않음
+VIDEO_IO_WORKERS = int(os.getenv("VIDEO_IO_WORKERS", "8"))
+# 소켓 전송과 겹쳐 미리 읽어 둘 청크 수 (시청자당 메모리 ≈ 이 값 × 청크 크기)
+VIDEO_READ_AHEAD = int(os.getenv("VIDEO_READ_AHEAD_CHUNKS", "4"))
+_video_io = ThreadPoolExecutor(max_workers=VIDEO_IO_WORKERS, thread_name_prefix="gridfs-io")
+# 같은 ObjectId의 내용은 바뀌지 않으므로 브라우저/프록시가 오래 보관해도 됨 (ETag로 재검증)
+VIDEO_CACHE_MAX_AGE = int(os.getenv("VIDEO_CACHE_MAX_AGE", "86400"))
+VIDEO_CACHE_CONTROL = os.getenv("VIDEO_CACHE_CONTROL", f"public, max-age={VIDEO_CACHE_MAX_AGE}")
+
+def video_validators(grid_out) -> Tuple[str, Optional[str]]:
+    """
+    GridFS 파일 문서 → (ETag, Last-Modified).
+    업로드 API로 올린 영상은 내용 해시(metadata.sha256), 그 외는 파일 ID + 버전으로 만든다.
+    """
+    sha256 = (grid_out.metadata or {}).get("sha256")
+    if not sha256:
+        sha256 = hashlib.sha256(f"{grid_out._id}:{file_version(grid_out)}".encode("utf-8")).hexdigest()
+    etag = f'"{sha256}"'
+    upload_date = grid_out.upload_date
+    if upload_date is None:
+        return etag, None
+    if upload_date.tzinfo is None:  # pymongo는 UTC naive datetime을 돌려줌
+        upload_date = upload_date.replace(tzinfo=timezone.utc)
+    return etag, format_datetime(upload_date, usegmt=True)
+
+def _parse_http_date(value: str) -> Optional[datetime]:
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[str]) -> bool:
+    """If-None-Match(우선) / If-Modified-Since → 304 여부."""
+    inm = request.headers.get("if-none-match")
+    if inm is not None:
+        tags = [t.strip().removeprefix("W/") for t in inm.split(",")]
+        return "*" in tags or etag in tags
+    ims = request.headers.get("if-modified-since")
+    if ims and last_modified:
+        since, modified = _parse_http_date(ims), _parse_http_date(last_modified)
+        return since is not None and modified is not None and modified <= since
+    return False
+
+def range_still_valid(request: Request, etag: str, last_modified: Optional[str]) -> bool:
+    """If-Range가 현재 버전과 다르면 Range를 무시하고 전체를 보낸다 (강한 비교)."""
+    if_range = request.headers.get("if-range")
+    if not if_range:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        return if_range == etag
+    return if_range == last_modified
+
+def iter_range(grid_out, start: int, end: int):
+    """
+    GridFS 청크 경계에 맞춰 [start, end] 구간만 읽음.
+    seek 후 read는 해당 오프셋의 청크 문서부터 가져오므로 앞부분 청크는 읽지 않는다.
+    """
+    chunk_size = grid_out.chunk_size
+    grid_out.seek(start)
+    pos = start
+    while pos <= end:
+        # 첫 읽기는 청크 끝까지만 → 이후 읽기는 청크 1개씩
+        n = min(chunk_size - (pos % chunk_size), end - pos + 1)
+        chunk = grid_out.read(n)
         if not chunk:
             break
+        pos += len(chunk)
         yield chunk
 
+async def aiter_range(grid_out, start: int, end: int):
+    """
+    iter_range를 전용 I/O 스레드에서 돌리고, 최대 VIDEO_READ_AHEAD개 청크를 미리 읽어 둔다.
+    Mongo 읽기와 소켓 쓰기가 겹치며, 클라이언트가 끊기면 읽기도 중단된다.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=VIDEO_READ_AHEAD)
+    chunks = iter_range(grid_out, start, end)
+
+    async def produce():
+        try:
+            while True:
+                chunk = await loop.run_in_executor(_video_io, next, chunks, None)
+                await queue.put(chunk)
+                if chunk is None:
+                    break
+        except Exception as e:
+            await queue.put(e)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        producer.cancel()
+
 @router.get("/{file_id}")
-def stream_video(file_id: str):
+async def stream_video(
+    file_id: str,
+    request: Request,
+    range_header: Optional[str] = Header(default=None, alias="range"),
+):
+    loop = asyncio.get_running_loop()
     try:
-        grid_out = fs_videos.get(ObjectId(file_id))
-        return StreamingResponse(
-            iterfile(grid_out),
-            media_type=grid_out.content_type or "video/mp4",
-        )
+        grid_out = await loop.run_in_executor(_video_io, fs_videos.get, ObjectId(file_id))
     except Exception:
-        raise HTTPException(status_code=404, detail="파일이 없거나 잘못된 ID입니다.")
\ No newline at end of file
+        raise HTTPException(status_code=404, detail="파일이 없거나 잘못된 ID입니다.")
+
+    size = grid_out.length
+    media_type = grid_out.content_type or "video/mp4"
+    etag, last_modified = video_validators(grid_out)
+    headers = {"Accept-Ranges": "bytes", "ETag": etag, "Cache-Control": VIDEO_CACHE_CONTROL}
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+
+    # 재생 반복 시 브라우저/프록시 캐시 재검증 → 본문 없이 304
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    if range_header and not range_still_valid(request, etag, last_modified):
+        range_header = None
+
+    # 자주 재생되는 영상은 로컬 디스크 사본으로 서빙 (Range/sendfile은 FileResponse가 처리)
+    version = file_version(grid_out)
+    cached_path = video_cache.lookup(file_id, version)
+    if cached_path is not None:
+        # 같은 검증자를 내려줘야 캐시 사본/GridFS 응답이 서로 재검증 가능
+        return FileResponse(cached_path, media_type=media_type, headers=headers)
+    # 플레이어는 한 번 재생에 Range 요청을 여러 번 보내므로 재생 시작(전체/bytes=0-)만 센다
+    if not range_header or range_header.replace(" ", "").lower().startswith("bytes=0-"):
+        video_cache.record_play(file_id, version, size)
+
+    if range_header:
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        if byte_range is not None:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            headers["Content-Length"] = str(end - start + 1)
+            return StreamingResponse(
+                aiter_range(grid_out, start, end),
+                status_code=206,
+                media_type=media_type,
+                headers=headers,
+            )
+
+    headers["Content-Length"] = str(size)
+    return StreamingResponse(
+        aiter_range(grid_out, 0, size - 1),
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+# =========================
+# 재개 가능한 청크 업로드 (GridFS 직행 + sha256 중복 제거)
+# =========================
+# 흐름: POST /uploads → PUT /uploads/{id}?offset=N (본문=바이트, 반복) → POST /uploads/{id}/complete
+# - 본문은 GridFS 청크 크기 단위로 잘라 videos.chunks에 바로 기록 (메모리에는 청크 1개 분량만)
+# - 청크 크기에 못 미치는 꼬리는 세션 문서에 보관 → 다음 PUT에서 이어 붙임
+# - sha256은 수신하면서 계산, 다른 워커/재시작으로 상태가 없으면 저장된 청크로 재계산
+UPLOAD_CHUNK_SIZE = gridfs.DEFAULT_CHUNK_SIZE  # 255KB
+VIDEO_UPLOAD_MAX_BYTES = int(os.getenv("VIDEO_UPLOAD_MAX_BYTES", str(4 * 1024 ** 3)))
+# 마지막 PUT 이후 이 시간(초)이 지난 세션은 청크와 함께 정리
+VIDEO_UPLOAD_SESSION_TTL = int(os.getenv("VIDEO_UPLOAD_SESSION_TTL", str(24 * 3600)))
+VIDEO_UPLOAD_SWEEP_INTERVAL = int(os.getenv("VIDEO_UPLOAD_SWEEP_INTERVAL", "3600"))
+
+_upload_sessions = mongo_db["video_uploads"]
+_video_files = mongo_db["videos.files"]
+_video_chunks = mongo_db["videos.chunks"]
+_upload_hashers: Dict[str, Tuple[int, Any]] = {}  # upload_id → (해시한 바이트 수, sha256 객체)
+_upload_locks: Dict[str, asyncio.Lock] = {}
+
+# 같은 내용은 한 번만 저장 / 청크 재전송은 덮어쓰기
+try:
+    _video_files.create_index(
+        "metadata.sha256",
+        unique=True,
+        partialFilterExpression={"metadata.sha256": {"$exists": True}},
+    )
+    _video_chunks.create_index([("files_id", 1), ("n", 1)], unique=True)
+    # 스윕이 멈춰도 세션 문서는 만료되도록 TTL 인덱스 (청크는 스윕이 정리)
+    _upload_sessions.create_index(
+        "updated_at", expireAfterSeconds=VIDEO_UPLOAD_SESSION_TTL + 2 * VIDEO_UPLOAD_SWEEP_INTERVAL
+    )
+except Exception:
+    pass
+
+async def _io(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_video_io, fn, *args)
+
+def _find_duplicate(digest: str) -> Optional[ObjectId]:
+    doc = _video_files.find_one({"metadata.sha256": digest}, {"_id": 1})
+    return doc["_id"] if doc else None
+
+def _load_session(upload_id: str, user_id: str) -> Dict[str, Any]:
+    if not ObjectId.is_valid(upload_id):
+        raise HTTPException(status_code=404, detail="업로드 세션이 없습니다.")
+    session = _upload_sessions.find_one({"_id": ObjectId(upload_id), "user_id": ObjectId(user_id)})
+    if session is None:
+        raise HTTPException(status_code=404, detail="업로드 세션이 없습니다.")
+    return session
+
+def _write_chunk(files_id: ObjectId, n: int, data: bytes) -> None:
+    _video_chunks.replace_one(
+        {"files_id": files_id, "n": n},
+        {"files_id": files_id, "n": n, "data": Binary(data)},
+        upsert=True,
+    )
+
+def _save_progress(files_id: ObjectId, offset: int, received: int, chunks: int, tail: bytes) -> bool:
+    """시작 오프셋이 그대로일 때만 반영 (다른 워커가 먼저 진행했으면 False)."""
+    result = _upload_sessions.update_one(
+        {"_id": files_id, "received": offset},
+        {"$set": {"received": received, "chunks": chunks, "tail": Binary(tail), "updated_at": datetime.utcnow()}},
+    )
+    return result.matched_count == 1
+
+def _rehash(session: Dict[str, Any]):
+    h = hashlib.sha256()
+    cursor = _video_chunks.find(
+        {"files_id": session["_id"], "n": {"$lt": session["chunks"]}}, {"data": 1}
+    ).sort("n", 1)
+    for doc in cursor:
+        h.update(doc["data"])
+    h.update(session["tail"])
+    return h
+
+async def _session_hasher(upload_id: str, session: Dict[str, Any]):
+    entry = _upload_hashers.get(upload_id)
+    if entry is not None and entry[0] == session["received"]:
+        return entry[1].copy()  # 요청이 중간에 실패해도 원본은 그대로
+    return await _io(_rehash, session)
+
+def _finalize(session: Dict[str, Any], digest: str) -> Dict[str, Any]:
+    files_id = session["_id"]
+    existing = _find_duplicate(digest)
+    if existing is None:
+        if session["tail"]:
+            _write_chunk(files_id, session["chunks"], bytes(session["tail"]))
+        try:
+            _video_files.insert_one({
+                "_id": files_id,
+                "length": session["length"],
+                "chunkSize": UPLOAD_CHUNK_SIZE,
+                "uploadDate": datetime.utcnow(),
+                "filename": session["filename"],
+                "contentType": session["content_type"],
+                "metadata": {"sha256": digest, "uploaded_by": session["user_id"]},
+            })
+            _upload_sessions.delete_one({"_id": files_id})
+            return {"file_id": str(files_id), "sha256": digest, "duplicate": False}
+        except DuplicateKeyError:  # 동시에 같은 영상이 먼저 완료됨
+            existing = _find_duplicate(digest)
+    _video_chunks.delete_many({"files_id": files_id})
+    _upload_sessions.delete_one({"_id": files_id})
+    return {"file_id": str(existing), "sha256": digest, "duplicate": True}
+
+def _upload_status(session: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "upload_id": str(session["_id"]),
+        "offset": session["received"],
+        "length": session["length"],
+        "chunk_size": UPLOAD_CHUNK_SIZE,
+    }
+
+def _sweep_uploads() -> Dict[str, int]:
+    """
+    만료 세션(마지막 PUT이 TTL 이전) 삭제 + 그 청크 삭제.
+    TTL 인덱스가 먼저 세션을 지운 경우를 위해, 오래된 files_id 중 파일/세션 어디에도 없는 청크도 정리.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=VIDEO_UPLOAD_SESSION_TTL)
+    removed = {"sessions": 0, "orphans": 0}
+    for session in _upload_sessions.find({"updated_at": {"$lt": cutoff}}, {"_id": 1}):
+        _video_chunks.delete_many({"files_id": session["_id"]})
+        removed["sessions"] += _upload_sessions.delete_one({"_id": session["_id"]}).deleted_count
+
+    # 세션 _id는 생성 시각을 담은 ObjectId → cutoff 이전 ID만 (files_id, n) 인덱스 범위로 조회
+    old_ids = _video_chunks.distinct(
+        "files_id", {"files_id": {"$lt": ObjectId.from_datetime(cutoff)}, "n": 0}
+    )
+    for i in range(0, len(old_ids), 1000):
+        batch = old_ids[i:i + 1000]
+        live = {d["_id"] for d in _video_files.find({"_id": {"$in": batch}}, {"_id": 1})}
+        live |= {d["_id"] for d in _upload_sessions.find({"_id": {"$in": batch}}, {"_id": 1})}
+        for files_id in batch:
+            if files_id not in live:
+                _video_chunks.delete_many({"files_id": files_id})
+                removed["orphans"] += 1
+    return removed
+
+def _live_session_ids(ids: list) -> set:
+    found = _upload_sessions.find({"_id": {"$in": [ObjectId(i) for i in ids]}}, {"_id": 1})
+    return {str(d["_id"]) for d in found}
+
+async def sweep_uploads() -> Dict[str, int]:
+    removed = await _io(_sweep_uploads)
+    # 이 프로세스의 해시/락 중 세션이 사라진 것 정리 (진행 중인 락은 유지)
+    ids = list(set(_upload_hashers) | set(_upload_locks))
+    live = await _io(_live_session_ids, ids) if ids else set()
+    for upload_id in ids:
+        if upload_id not in live:
+            _upload_hashers.pop(upload_id, None)
+            lock = _upload_locks.get(upload_id)
+            if lock is not None and not lock.locked():
+                del _upload_locks[upload_id]
+    return removed
+
+async def run_upload_sweeper() -> None:
+    """앱 lifespan에서 백그라운드로 실행."""
+    while True:
+        try:
+            await sweep_uploads()
+        except Exception:
+            traceback.print_exc()
+        await asyncio.sleep(VIDEO_UPLOAD_SWEEP_INTERVAL)
+
+@router.post("/uploads", status_code=201)
+async def create_upload(payload: VideoUploadInit, user_id: str = Depends(require_user_id)):
+    if payload.length > VIDEO_UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="업로드 가능한 크기를 초과했습니다.")
+    if payload.sha256:
+        existing = await _io(_find_duplicate, payload.sha256.lower())
+        if existing is not None:  # 이미 있는 영상 → 전송 생략
+            return {"file_id": str(existing), "sha256": payload.sha256.lower(), "duplicate": True}
+
+    now = datetime.utcnow()
+    session = {
+        "_id": ObjectId(),  # 완료 시 그대로 GridFS 파일 ID
+        "user_id": ObjectId(user_id),
+        "filename": payload.filename,
+        "content_type": payload.content_type,
+        "length": payload.length,
+        "received": 0,
+        "chunks": 0,
+        "tail": Binary(b""),
+        "created_at": now,
+        "updated_at": now,
+    }
+    await _io(_upload_sessions.insert_one, session)
+    return _upload_status(session)
+
+@router.get("/uploads/{upload_id}")
+async def get_upload(upload_id: str, user_id: str = Depends(require_user_id)):
+    """끊긴 업로드를 이어갈 오프셋 조회."""
+    return _upload_status(await _io(_load_session, upload_id, user_id))
+
+@router.put("/uploads/{upload_id}")
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    user_id: str = Depends(require_user_id),
+):
+    lock = _upload_locks.setdefault(upload_id, asyncio.Lock())
+    async with lock:
+        session = await _io(_load_session, upload_id, user_id)
+        if offset != session["received"]:
+            raise HTTPException(status_code=409, detail={"message": "오프셋이 맞지 않습니다.", "offset": session["received"]})
+
+        files_id, length = session["_id"], session["length"]
+        hasher = await _session_hasher(upload_id, session)
+        buf = bytearray(session["tail"])
+        chunks, received = session["chunks"], session["received"]
+        try:
+            async for part in request.stream():
+                if received + len(part) > length:
+                    raise HTTPException(status_code=413, detail="선언한 길이를 초과했습니다.")
+                hasher.update(part)
+                buf += part
+                received += len(part)
+                while len(buf) >= UPLOAD_CHUNK_SIZE:
+                    await _io(_write_chunk, files_id, chunks, bytes(buf[:UPLOAD_CHUNK_SIZE]))
+                    del buf[:UPLOAD_CHUNK_SIZE]
+                    chunks += 1
+        except ClientDisconnect:
+            pass  # 받은 데까지 저장 → 클라이언트는 GET으로 오프셋 확인 후 재개
+
+        if not await _io(_save_progress, files_id, offset, received, chunks, bytes(buf)):
+            _upload_hashers.pop(upload_id, None)
+            raise HTTPException(status_code=409, detail={"message": "다른 요청이 먼저 이 구간을 기록했습니다. 오프셋을 다시 조회하세요."})
+        _upload_hashers[upload_id] = (received, hasher)
+    return {"upload_id": upload_id, "offset": received, "length": length, "complete": received == length}
+
+@router.post("/uploads/{upload_id}/complete")
+async def complete_upload(upload_id: str, user_id: str = Depends(require_user_id)):
+    lock = _upload_locks.setdefault(upload_id, asyncio.Lock())
+    async with lock:
+        session = await _io(_load_session, upload_id, user_id)
+        if session["received"] != session["length"]:
+            raise HTTPException(status_code=409, detail={"message": "아직 전송되지 않은 구간이 있습니다.", "offset": session["received"]})
+        digest = (await _session_hasher(upload_id, session)).hexdigest()
+        result = await _io(_finalize, session, digest)
+        _upload_hashers.pop(upload_id, None)
+    _upload_locks.pop(upload_id, None)
+    return result
+
+
+# =========================
+# 영상 목록 (projection + keyset 페이지네이션)
+# =========================
+# 정렬: uploadDate 내림차순, 동률은 _id 내림차순 → 커서 = 마지막 항목의 (uploadDate, _id)
+# skip을 쓰지 않으므로 몇 번째 페이지든 인덱스 범위 탐색 한 번으로 끝난다.
+VIDEO_LIST_PROJECTION = {"filename": 1, "length": 1, "contentType": 1, "uploadDate": 1, "metadata.sha256": 1}
+
+try:
+    _video_files.create_index([("uploadDate", -1), ("_id", -1)])
+except Exception:
+    pass
+
+def encode_cursor(upload_date: datetime, file_id: ObjectId) -> str:
+    if upload_date.tzinfo is None:
+        upload_date = upload_date.replace(tzinfo=timezone.utc)
+    raw = f"{int(upload_date.timestamp() * 1000)}:{file_id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        ms, file_id = raw.split(":", 1)
+        return datetime.fromtimestamp(int(ms) / 1000, tz=timezone.utc), ObjectId(file_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
+def _list_videos(query: Dict[str, Any], limit: int):
+    cursor = (
+        _video_files.find(query, VIDEO_LIST_PROJECTION)
+        .sort([("uploadDate", -1), ("_id", -1)])
+        .limit(limit + 1)  # 한 건 더 읽어 다음 페이지 존재 여부 판단
+    )
+    return list(cursor)
+
+@router.get("")
+async def list_videos(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+):
+    query: Dict[str, Any] = {}
+    if cursor:
+        upload_date, file_id = decode_cursor(cursor)
+        query = {"$or": [
+            {"uploadDate": {"$lt": upload_date}},
+            {"uploadDate": upload_date, "_id": {"$lt": file_id}},
+        ]}
+
+    docs = await _io(_list_videos, query, limit)
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    items = [
+        {
+            "id": str(d["_id"]),
+            "filename": d.get("filename"),
+            "length": d.get("length"),
+            "content_type": d.get("contentType") or "video/mp4",
+            "upload_date": d.get("uploadDate"),
+            "sha256": (d.get("metadata") or {}).get("sha256"),
+        }
+        for d in docs
+    ]
+    next_cursor = encode_cursor(docs[-1]["uploadDate"], docs[-1]["_id"]) if has_more else None
+    return {"items": items, "next_cursor": next_cursor}
@@ -1,4 +1,5 @@
 import os
+import hashlib
 from dotenv import load_dotenv
 from fastapi.responses import StreamingResponse
 from pymongo import MongoClient
@@ -18,7 +19,17 @@ fs = gridfs.GridFS(db, collection="videos")
 
 file_path = "./assets/backend.mp4"
 
+# API 업로드(/api/video/uploads)와 같은 기준으로 중복 제거: metadata.sha256
+sha256 = hashlib.sha256()
 with open(file_path, "rb") as f:
-    file_id = fs.put(f, filename="backend.mp4", content_type="video/mp4")
+    for block in iter(lambda: f.read(1024 * 1024), b""):
+        sha256.update(block)
+digest = sha256.hexdigest()
 
-print(f"파일 업로드 완료! 파일 ID: {file_id}")
\ No newline at end of file
+existing = db["videos.files"].find_one({"metadata.sha256": digest}, {"_id": 1})
+if existing:
+    print(f"이미 업로드된 영상입니다. 파일 ID: {existing['_id']}")
+else:
+    with open(file_path, "rb") as f:
+        file_id = fs.put(f, filename="backend.mp4", content_type="video/mp4", metadata={"sha256": digest})
+    print(f"파일 업로드 완료! 파일 ID: {file_id}")
\ No newline at end of file
@@ -0,0 +1,86 @@
+# 메타인지 조언 캐시 사전 생성 (오프라인 작업)
+#   python warm_metacognition_advice.py [--dry-run] [--allow-skip] [--concurrency 4]
+# - WEIGHTS로 도달 가능한 점수 벡터를 문항 순서대로 DP 전개해 모두 구함
+# - 캐시(metacognition_advice)에 없는 벡터만 OpenAI로 생성해 저장
+import sys
+import asyncio
+import argparse
+from typing import Dict, Set, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from data.metacognition_weights import WEIGHTS, CATEGORIES  # noqa: E402
+from routers.metacognition import (  # noqa: E402
+    AI_ENABLED, AI_TIMEOUT_DEFAULT, OPENAI_API_KEY,
+    get_cached_advice, store_advice, try_llm_advice,
+)
+
+
+def reachable_vectors(allow_skip: bool = False) -> Set[Tuple[int, ...]]:
+    """
+    문항마다 선택지(A~D, allow_skip이면 무응답 포함)를 더해 가며 도달 가능한 점수 벡터 집합을 구한다.
+    4^10 조합을 펼치지 않고 문항별로 중복 벡터를 합치므로 결과 크기에 비례해서만 커진다.
+    """
+    index = {c: i for i, c in enumerate(CATEGORIES)}
+    vectors: Set[Tuple[int, ...]] = {(0,) * len(CATEGORIES)}
+    for qid in sorted(WEIGHTS):
+        deltas = []
+        for choice in WEIGHTS[qid].values():
+            d = [0] * len(CATEGORIES)
+            for cat, inc in choice.items():
+                if cat in index:
+                    d[index[cat]] += int(inc)
+            deltas.append(d)
+        if allow_skip:
+            deltas.append([0] * len(CATEGORIES))
+        vectors = {tuple(v + d for v, d in zip(vec, delta)) for vec in vectors for delta in deltas}
+    return vectors
+
+
+async def warm(vectors, concurrency: int) -> Dict[str, int]:
+    counts = {"cached": 0, "generated": 0, "failed": 0}
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(vec: Tuple[int, ...]) -> None:
+        scores = dict(zip(CATEGORIES, vec))
+        if await asyncio.to_thread(get_cached_advice, scores) is not None:
+            counts["cached"] += 1
+            return
+        async with sem:
+            advice = await try_llm_advice(scores, {}, AI_TIMEOUT_DEFAULT)
+        if not advice:
+            counts["failed"] += 1
+            return
+        await asyncio.to_thread(store_advice, scores, advice)
+        counts["generated"] += 1
+        done = counts["generated"] + counts["failed"]
+        if done % 50 == 0:
+            print(f"  ... {done} 처리")
+
+    await asyncio.gather(*(one(v) for v in sorted(vectors)))
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="메타인지 조언 캐시 사전 생성")
+    parser.add_argument("--dry-run", action="store_true", help="벡터 수만 출력")
+    parser.add_argument("--allow-skip", action="store_true", help="무응답 문항이 있는 조합도 포함")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 OpenAI 호출 수")
+    args = parser.parse_args()
+
+    vectors = reachable_vectors(args.allow_skip)
+    print(f"도달 가능한 점수 벡터: {len(vectors)}개")
+    if args.dry_run:
+        return
+    if not (AI_ENABLED and OPENAI_API_KEY):
+        print("AI_ANALYSIS_ENABLED/OPENAI_API_KEY 설정이 필요합니다.")
+        sys.exit(1)
+
+    counts = asyncio.run(warm(vectors, args.concurrency))
+    print(f"완료: 기존 {counts['cached']} / 생성 {counts['generated']} / 실패 {counts['failed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# bench_pdf.py
+# 요약 PDF 렌더링 처리량 벤치마크 (PDFs/second)
+#   python bench_pdf.py [N]
+# - before: 요청마다 FPDF 생성 + add_font (이벤트 루프에서 직렬 실행)
+# - after : pdf_service 프로세스 풀 (워커당 폰트 1회 로드)
+import sys
+import time
+import asyncio
+
+from fpdf import FPDF
+
+from pdf_service import FONT_PATH, render_summary_pdf_async, shutdown_pdf_executor
+
+JOB_TITLE = "백엔드 개발자"
+SUMMARY = (
+    "FastAPI 기반 채용 서류 분석 서비스를 설계/구현했습니다. "
+    "OpenAI 임베딩으로 이전 버전과의 유사도를 계산해 피드백 품질을 높였고, "
+    "MongoDB GridFS로 면접 영상을 스트리밍합니다.\n"
+) * 8
+
+
+def render_legacy(job_title: str, summary_text: str) -> bytes:
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_font("NotoSansKR", "", str(FONT_PATH), uni=True)
+    pdf.set_font("NotoSansKR", "", 12)
+    pdf.multi_cell(0, 10, txt=f"{job_title} 요약본\n", align="C")
+    pdf.ln(10)
+    pdf.set_font("NotoSansKR", "", 14)
+    pdf.cell(0, 10, "▶ 포트폴리오 요약", ln=1, align="L")
+    pdf.set_font("NotoSansKR", "", 12)
+    pdf.multi_cell(0, 10, txt=summary_text)
+    pdf.ln(10)
+    out = pdf.output(dest="S")
+    return out.encode("latin-1") if isinstance(out, str) else bytes(out)
+
+
+async def bench_after(n: int) -> float:
+    # 워커 기동/폰트 로드는 측정에서 제외
+    await render_summary_pdf_async(JOB_TITLE, SUMMARY)
+    t0 = time.perf_counter()
+    await asyncio.gather(*[render_summary_pdf_async(JOB_TITLE, SUMMARY) for _ in range(n)])
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    t0 = time.perf_counter()
+    for _ in range(n):
+        render_legacy(JOB_TITLE, SUMMARY)
+    before = time.perf_counter() - t0
+
+    after = asyncio.run(bench_after(n))
+    shutdown_pdf_executor()
+
+    print(f"PDFs: {n}")
+    print(f"before: {n / before:8.2f} PDFs/s ({before * 1000 / n:.1f} ms/PDF, event loop blocked)")
+    print(f"after : {n / after:8.2f} PDFs/s ({after * 1000 / n:.1f} ms/PDF, off the event loop)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+# bench_prompt_cache.py
+# 프롬프트 prefix 캐시 측정: cached-token 비율 / 캐시 적중 시 지연 단축
+#   OPENAI_API_KEY=... python bench_prompt_cache.py [N]
+# 직무를 바꿔 가며 자기소개서 분석을 N회 호출합니다. system 지시문이 요청 간 동일하므로
+# 두 번째 호출부터 prompt_tokens_details.cached_tokens가 잡혀야 합니다.
+import sys
+import json
+import asyncio
+
+from job_catalog import get_catalog
+from utils import get_ai_feedback, get_prompt_cache_stats
+
+SAMPLE_COVER_LETTER = {
+    "reason_for_application": "데이터로 사용자 경험을 개선하는 서비스에 기여하고 싶어 지원했습니다.",
+    "expertise_experience": "FastAPI와 MongoDB로 사내 문서 분석 도구를 만들어 응답 시간을 40% 줄였습니다.",
+    "collaboration_experience": "프론트엔드/디자인 팀과 주간 리뷰를 운영해 릴리스 일정을 지켰습니다.",
+    "challenging_goal_experience": "3주 안에 영상 스트리밍 기능을 출시하는 목표를 세우고 달성했습니다.",
+    "growth_process": "오픈소스 기여와 스터디로 꾸준히 성장해 왔습니다.",
+}
+
+
+async def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    titles = get_catalog().titles
+    for i in range(n):
+        await get_ai_feedback(titles[i % len(titles)], "cover_letter", SAMPLE_COVER_LETTER)
+    print(json.dumps(get_prompt_cache_stats(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,148 @@
+# http_cache.py
+# 사용자 산출물(PDF/JSON) 응답 공통 처리
+# - 내용 해시 기반 강한 ETag, Last-Modified
+# - If-None-Match / If-Modified-Since → 304
+# - Range / If-Range → 206 (단일 구간)
+import os
+import sys
+import asyncio
+import hashlib
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response, FileResponse, JSONResponse
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.append(str(_REPO_ROOT))
+
+from common.http_range import parse_range  # noqa: E402  (gal/ 영상 스트리밍과 같은 구현)
+
+# 사용자별(인증) 산출물이므로 공유 캐시 금지, 브라우저는 저장 후 매번 재검증(304)
+ARTIFACT_CACHE_CONTROL = os.getenv("ARTIFACT_CACHE_CONTROL", "private, no-cache")
+
+_ETAG_MEMO_MAX = 4096
+_etag_memo: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()  # path → (mtime_ns, size, etag)
+
+
+# =========================
+# 검증자
+# =========================
+def _hash_etag(data: bytes) -> str:
+    return '"' + hashlib.sha256(data).hexdigest() + '"'
+
+def _memo_etag(path: Path, st: os.stat_result) -> Optional[str]:
+    key = str(path)
+    memo = _etag_memo.get(key)
+    if memo and memo[0] == st.st_mtime_ns and memo[1] == st.st_size:
+        _etag_memo.move_to_end(key)
+        return memo[2]
+    return None
+
+def file_etag(path: Path, st: os.stat_result) -> str:
+    """파일 내용 sha256 기반 강한 ETag. (mtime, size)가 같으면 다시 해시하지 않음."""
+    key = str(path)
+    memo = _memo_etag(path, st)
+    if memo:
+        return memo
+    h = hashlib.sha256()
+    with open(key, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    etag = '"' + h.hexdigest() + '"'
+    _etag_memo[key] = (st.st_mtime_ns, st.st_size, etag)
+    if len(_etag_memo) > _ETAG_MEMO_MAX:
+        _etag_memo.popitem(last=False)
+    return etag
+
+def _etag_in(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    tags = [t.strip() for t in header.split(",")]
+    return any((t[2:] if t.startswith("W/") else t) == etag for t in tags)
+
+def _not_modified_since(header: Optional[str], mtime: Optional[float]) -> bool:
+    if not header or mtime is None:
+        return False
+    try:
+        return int(mtime) <= int(parsedate_to_datetime(header).timestamp())
+    except (TypeError, ValueError):
+        return False
+
+def is_not_modified(request: Request, etag: str, mtime: Optional[float] = None) -> bool:
+    inm = request.headers.get("if-none-match")
+    if inm is not None:  # If-None-Match가 있으면 If-Modified-Since는 무시 (RFC 9110)
+        return _etag_in(inm, etag)
+    return _not_modified_since(request.headers.get("if-modified-since"), mtime)
+
+
+# =========================
+# Range
+# =========================
+def _range_applies(request: Request, etag: str, mtime: float) -> bool:
+    if_range = request.headers.get("if-range")
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag  # If-Range는 강한 비교
+    return _not_modified_since(if_range, mtime)
+
+
+# =========================
+# 응답 헬퍼
+# =========================
+def _read_range(path: Path, start: int, end: int) -> bytes:
+    with open(str(path), "rb") as f:
+        f.seek(start)
+        return f.read(end - start + 1)
+
+async def file_response(
+    request: Request,
+    path: Path,
+    media_type: str,
+    headers: Optional[Dict[str, str]] = None,
+    cache_control: str = ARTIFACT_CACHE_CONTROL,
+) -> Response:
+    st = path.stat()
+    # 첫 요청의 전체 해시는 워커 스레드에서 (이벤트 루프를 막지 않음)
+    etag = _memo_etag(path, st) or await asyncio.to_thread(file_etag, path, st)
+    base_headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+    }
+    if is_not_modified(request, etag, st.st_mtime):
+        return Response(status_code=304, headers=base_headers)
+
+    all_headers = {**base_headers, **(headers or {})}
+    range_header = request.headers.get("range")
+    if range_header and _range_applies(request, etag, st.st_mtime):
+        try:
+            byte_range = parse_range(range_header, st.st_size)
+        except ValueError:
+            return Response(status_code=416, headers={**base_headers, "Content-Range": f"bytes */{st.st_size}"})
+        if byte_range is not None:
+            start, end = byte_range
+            body = await asyncio.to_thread(_read_range, path, start, end)
+            all_headers["Content-Range"] = f"bytes {start}-{end}/{st.st_size}"
+            return Response(content=body, status_code=206, media_type=media_type, headers=all_headers)
+
+    return FileResponse(path=str(path), media_type=media_type, headers=all_headers, stat_result=st)
+
+def json_response(
+    request: Request,
+    content: Any,
+    cache_control: str = ARTIFACT_CACHE_CONTROL,
+) -> Response:
+    """JSON 본문 해시로 ETag를 붙이고, 일치하면 본문 없이 304."""
+    resp = JSONResponse(content=content)
+    etag = _hash_etag(resp.body)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    resp.headers.update(headers)
+    return resp
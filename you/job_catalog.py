@@ -0,0 +1,174 @@
+# job_catalog.py
+# 직무 카탈로그
+# - slug ↔ title 맵을 로드 시점에 한 번만 계산 (요청당 O(1) 조회)
+# - 별칭 조회 (오타 허용 조회는 페이지 라우트 전용)
+# - 데이터 파일(JOB_CATALOG_FILE)이 바뀌면 재시작 없이 다시 로드
+import os
+import re
+import math
+import json
+import time
+import difflib
+import threading
+import traceback
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+from job_data import JOB_CATEGORIES, JOB_DETAILS, JOB_ALIASES
+
+BASE_DIR = Path(__file__).resolve().parent
+# 선택 파일: {"categories": {...}, "details": {...}, "aliases": {...}}
+# 없으면 job_data.py의 기본 데이터를 사용
+JOB_CATALOG_FILE = Path(os.getenv("JOB_CATALOG_FILE", str(BASE_DIR / "data" / "job_catalog.json")))
+JOB_CATALOG_RELOAD_INTERVAL = float(os.getenv("JOB_CATALOG_RELOAD_INTERVAL", "5"))
+FUZZY_CUTOFF = 0.8
+_FUZZY_MEMO_MAX = 1024
+_FUZZY_MAX_KEY_LEN = 64  # 이보다 긴 입력은 오타 비교 없이 미일치
+
+
+def slugify_job_title(job_title: str) -> str:
+    return job_title.replace(" ", "-").replace("/", "-").lower()
+
+def _lookup_key(text: str) -> str:
+    """별칭/오타 비교용 정규화 키 (공백·구분자 제거, 소문자)."""
+    return re.sub(r"[\s\-_/]+", "", unquote(text)).lower()
+
+
+class JobCatalog:
+    def __init__(
+        self,
+        categories: Dict[str, List[str]],
+        details: Dict[str, Dict[str, Any]],
+        aliases: Optional[Dict[str, str]] = None,
+        version: int = 0,
+    ):
+        self.categories = categories
+        self.details = details
+        self.version = version
+
+        self.titles: List[str] = [t for jobs in categories.values() for t in jobs]
+        self.title_to_slug: Dict[str, str] = {t: slugify_job_title(t) for t in self.titles}
+        self.slug_to_title: Dict[str, str] = {slug: t for t, slug in self.title_to_slug.items()}
+
+        # 정규화 키 → 정식 직무명 (직무명/slug 자체 + 별칭)
+        self._key_to_title: Dict[str, str] = {}
+        for t in self.titles:
+            self._key_to_title[_lookup_key(t)] = t
+        for alias, t in (aliases or {}).items():
+            if t in self.title_to_slug:
+                self._key_to_title.setdefault(_lookup_key(alias), t)
+        # 오타 후보 인덱스: (첫 글자, 길이) → 키 목록.
+        # difflib ratio ≥ cutoff이려면 길이 비가 일정 범위 안이어야 하므로 그 길이대만 비교
+        self._fuzzy_index: Dict[Tuple[str, int], List[str]] = {}
+        for k in self._key_to_title:
+            if k:
+                self._fuzzy_index.setdefault((k[0], len(k)), []).append(k)
+        self._fuzzy_memo: "OrderedDict[str, Optional[str]]" = OrderedDict()
+
+    @classmethod
+    def from_file(cls, path: Path, version: int = 0) -> "JobCatalog":
+        with open(str(path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        categories = data.get("categories") or JOB_CATEGORIES
+        details = {**JOB_DETAILS, **(data.get("details") or {})}
+        aliases = {**JOB_ALIASES, **(data.get("aliases") or {})}
+        return cls(categories, details, aliases, version=version)
+
+    @classmethod
+    def from_defaults(cls, version: int = 0) -> "JobCatalog":
+        return cls(JOB_CATEGORIES, JOB_DETAILS, JOB_ALIASES, version=version)
+
+    def title_for_slug(self, job_slug: str, fuzzy: bool = False) -> Optional[str]:
+        """
+        정식 slug → 별칭 순으로 직무명을 찾습니다.
+        fuzzy=True(페이지 라우트)일 때만 오타 허용 비교까지 수행합니다.
+        """
+        decoded = unquote(job_slug)
+        title = self.slug_to_title.get(decoded)
+        if title:
+            return title
+        key = _lookup_key(decoded)
+        title = self._key_to_title.get(key)
+        if title or not key or not fuzzy or len(key) > _FUZZY_MAX_KEY_LEN:
+            return title
+        return self._fuzzy_title(key)
+
+    def _fuzzy_candidates(self, key: str) -> List[str]:
+        lo = math.ceil(len(key) * FUZZY_CUTOFF / (2 - FUZZY_CUTOFF))
+        hi = math.floor(len(key) * (2 - FUZZY_CUTOFF) / FUZZY_CUTOFF)
+        out: List[str] = []
+        for n in range(lo, hi + 1):
+            out.extend(self._fuzzy_index.get((key[0], n), ()))
+        return out
+
+    def _fuzzy_title(self, key: str) -> Optional[str]:
+        if key in self._fuzzy_memo:
+            self._fuzzy_memo.move_to_end(key)
+            return self._fuzzy_memo[key]
+        match = difflib.get_close_matches(key, self._fuzzy_candidates(key), n=1, cutoff=FUZZY_CUTOFF)
+        title = self._key_to_title[match[0]] if match else None
+        self._fuzzy_memo[key] = title
+        if len(self._fuzzy_memo) > _FUZZY_MEMO_MAX:
+            self._fuzzy_memo.popitem(last=False)
+        return title
+
+    def slug_for_title(self, job_title: str) -> str:
+        return self.title_to_slug.get(job_title) or slugify_job_title(job_title)
+
+    def get_details(self, job_title: Optional[str]) -> Dict[str, Any]:
+        return self.details.get(job_title or "", {})
+
+
+# =========================
+# 전역 카탈로그 + 핫 리로드
+# =========================
+_lock = threading.Lock()
+_catalog: JobCatalog = JobCatalog.from_defaults()
+_catalog_mtime: Optional[float] = None
+_last_check = 0.0
+_reload_listeners: List[Callable[[JobCatalog], None]] = []
+
+def _file_mtime() -> Optional[float]:
+    try:
+        return JOB_CATALOG_FILE.stat().st_mtime
+    except OSError:
+        return None
+
+def reload_catalog(force: bool = False) -> JobCatalog:
+    """데이터 파일이 바뀌었으면(또는 force) 다시 컴파일하고 리스너에 알립니다."""
+    global _catalog, _catalog_mtime, _last_check
+    with _lock:
+        _last_check = time.monotonic()
+        mtime = _file_mtime()
+        if not force and mtime == _catalog_mtime:
+            return _catalog
+        next_version = _catalog.version + 1
+        try:
+            catalog = JobCatalog.from_file(JOB_CATALOG_FILE, next_version) if mtime is not None \
+                else JobCatalog.from_defaults(next_version)
+        except Exception:
+            # 잘못된 파일이면 기존 카탈로그 유지
+            traceback.print_exc()
+            _catalog_mtime = mtime
+            return _catalog
+        _catalog, _catalog_mtime = catalog, mtime
+        listeners = list(_reload_listeners)
+    for listener in listeners:
+        try:
+            listener(catalog)
+        except Exception:
+            traceback.print_exc()
+    return catalog
+
+def get_catalog() -> JobCatalog:
+    if time.monotonic() - _last_check >= JOB_CATALOG_RELOAD_INTERVAL:
+        return reload_catalog()
+    return _catalog
+
+def on_catalog_reload(listener: Callable[[JobCatalog], None]) -> None:
+    """카탈로그가 다시 로드될 때 호출될 콜백 등록 (사전 인코딩 캐시 갱신 등)."""
+    _reload_listeners.append(listener)
+
+reload_catalog(force=True)
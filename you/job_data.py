@@ -28,6 +28,24 @@ JOB_CATEGORIES = {
     ]
 }
 
+# 직무 별칭 (별칭 → 정식 직무명). slug/오타 허용 조회에 사용
+JOB_ALIASES = {
+    "프론트엔드": "프론트엔드 개발자",
+    "프론트": "프론트엔드 개발자",
+    "frontend": "프론트엔드 개발자",
+    "백엔드": "백엔드 개발자",
+    "backend": "백엔드 개발자",
+    "데이터 개발자": "AI/데이터 개발자",
+    "ai 개발자": "AI/데이터 개발자",
+    "devops": "DevOps/인프라 개발자",
+    "인프라 개발자": "DevOps/인프라 개발자",
+    "pm": "프로덕트 매니저",
+    "hr": "HR 담당자",
+    "인사 담당자": "HR 담당자",
+    "회계": "재무/회계",
+    "qa": "품질보증",
+}
+
 # 각 직무별 필수 역량 및 자격증 데이터
 JOB_DETAILS = {
     # 개발
@@ -344,20 +362,13 @@ for category_jobs in JOB_CATEGORIES.values():
         slug = job_title.replace(" ", "-").replace("/", "-").lower()
         ALL_JOB_SLUGS.append(slug)
 
-def get_job_document_schema(job_slug: str, doc_type: str) -> Optional[Dict[str, Any]]:
+def get_job_document_schema(job_title: str, doc_type: str) -> Optional[Dict[str, Any]]:
     """
     주어진 문서 타입에 맞는 양식 스키마를 반환합니다.
     현재는 직무에 상관없이 문서 타입별 공통 스키마를 사용합니다.
+    (slug → job_title 변환은 job_catalog.JobCatalog에서 미리 계산된 맵으로 처리)
     """
-    # job_slug를 실제 job_title로 변환 (필요시)
-    job_title_map = {}
-    for category_jobs in JOB_CATEGORIES.values():
-        for jt in category_jobs:
-            job_title_map[jt.replace(" ", "-").replace("/", "-").lower()] = jt
-
-    actual_job_title = job_title_map.get(job_slug)
-    
     # 향후 job_title에 따라 스키마를 다르게 줄 수도 있습니다.
-    # 예: if actual_job_title == "프론트엔드 개발자": return specific_frontend_resume_schema
+    # 예: if job_title == "프론트엔드 개발자": return specific_frontend_resume_schema
     
     return JOB_DOCUMENT_SCHEMAS.get(doc_type)
\ No newline at end of file
@@ -1,8 +1,7 @@
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request, HTTPException, Depends, UploadFile, File, Form
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from typing import Dict, Any, Optional, List
 from pathlib import Path
@@ -15,16 +14,29 @@ load_dotenv()
 # --- utils ---
 from utils import (
     get_job_title_from_slug,
+    canonical_job_slug,
     get_ai_feedback,
     load_company_analysis,
     get_embedding,
     calculate_content_hash,
-    summarize_portfolio_and_generate_pdf,
+    summarize_portfolio,
+    ensure_portfolio_summary_pdf,
+    remove_summary_manifest,
 )
 
 # --- JWT(dep) ---
 from auth_local import get_current_user  # Authorization: Bearer ... → user_id(str)
-from job_data import JOB_CATEGORIES, JOB_DETAILS, get_job_document_schema
+from job_catalog import get_catalog
+from response_cache import (
+    PAGE_CACHE_CONTROL,
+    encoded_response,
+    get_schema_payload,
+    get_catalog_payload,
+    get_index_page,
+    get_editor_page,
+)
+from pdf_service import shutdown_pdf_executor
+from http_cache import file_response, json_response
 
 app = FastAPI()
 
@@ -38,7 +50,6 @@ os.makedirs(STATIC_DIR, exist_ok=True)
 os.makedirs(TEMPLATES_DIR, exist_ok=True)
 
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
-templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 
 # ---- CORS (dev) ----
 app.add_middleware(
@@ -49,6 +60,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("shutdown")
+def _shutdown_workers():
+    shutdown_pdf_executor()
+
 # -------- helpers --------
 def _list_version_files(doc_dir: Path) -> List[str]:
     if not doc_dir.is_dir():
@@ -103,44 +118,48 @@ class UserProfile(BaseModel):
     certificates: list[str] = []
 
 # -------- pages/schema --------
+# 페이지는 시작/카탈로그 리로드 시 미리 렌더링된 바이트(+gzip)를 ETag와 함께 반환
 @app.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request, "job_categories": JOB_CATEGORIES})
+    get_catalog()  # 카탈로그 변경 감지 → 페이지 재렌더링
+    return encoded_response(request, get_index_page(), PAGE_CACHE_CONTROL)
 
 @app.get("/editor/{job_slug}", response_class=HTMLResponse)
 async def get_document_editor_page(request: Request, job_slug: str):
-    job_title = get_job_title_from_slug(job_slug)
-    if not job_title:
+    job_title = get_job_title_from_slug(job_slug, fuzzy=True)
+    page = get_editor_page(job_title) if job_title else None
+    if not page:
         raise HTTPException(status_code=404, detail=f"Job not found: {unquote(job_slug)}")
-    job_details = JOB_DETAILS.get(job_title, {})
-    return templates.TemplateResponse(
-        "document_editor.html",
-        {"request": request, "job_title": job_title, "job_slug": job_slug, "job_details": job_details}
-    )
+    return encoded_response(request, page, PAGE_CACHE_CONTROL)
 
 @app.get("/apiText/document_schema/{doc_type}", response_class=JSONResponse)
-async def get_document_schema_endpoint(doc_type: str, job_slug: str):
+async def get_document_schema_endpoint(request: Request, doc_type: str, job_slug: str):
     job_title = get_job_title_from_slug(job_slug)
     if not job_title:
         raise HTTPException(status_code=404, detail="Job not found")
-    schema = get_job_document_schema(job_title, doc_type)
-    if not schema:
+    # 시작/카탈로그 리로드 시 미리 인코딩된 바이트 + ETag
+    payload = get_schema_payload(job_title, doc_type)
+    if not payload:
         raise HTTPException(status_code=404, detail="Document schema not found for this type or job.")
-    return JSONResponse(content=schema)
+    return encoded_response(request, payload)
+
+@app.get("/apiText/job_catalog", response_class=JSONResponse)
+async def get_job_catalog_endpoint(request: Request):
+    return encoded_response(request, get_catalog_payload())
 
 # -------- profile (mypage) --------
 @app.get("/apiText/user_profile", response_class=JSONResponse)
-async def get_user_profile(user_id: str = Depends(get_current_user)):
+async def get_user_profile(request: Request, user_id: str = Depends(get_current_user)):
     p = _user_profile_file(user_id)
     if not p.exists():
-        return JSONResponse(content={
+        return json_response(request, {
             "education": [{"level": "", "status": "", "school": "", "major": ""}],
             "activities": [{"title": "", "content": ""}],
             "awards": [{"title": "", "content": ""}],
             "certificates": [""],
         })
     try:
-        return JSONResponse(content=_load_json(p))
+        return json_response(request, _load_json(p))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to read profile: {e}")
 
@@ -155,10 +174,11 @@ async def save_user_profile(profile: UserProfile, user_id: str = Depends(get_cur
 
 # -------- load documents --------
 @app.get("/apiText/load_documents/{job_slug}", response_class=JSONResponse)
-async def api_load_documents(job_slug: str, user_id: str = Depends(get_current_user)):
+async def api_load_documents(request: Request, job_slug: str, user_id: str = Depends(get_current_user)):
     job_title = get_job_title_from_slug(job_slug)
     if not job_title:
         raise HTTPException(status_code=404, detail=f"Job not found for slug: {unquote(job_slug)}")
+    job_slug = canonical_job_slug(job_title)
     try:
         result: Dict[str, List[Dict[str, Any]]] = {"resume": [], "cover_letter": [], "portfolio": []}
         for doc_type in result.keys():
@@ -168,7 +188,7 @@ async def api_load_documents(job_slug: str, user_id: str = Depends(get_current_u
                     result[doc_type].append(_load_json(d / name))
                 except Exception:
                     traceback.print_exc()
-        return JSONResponse(content=result)
+        return json_response(request, result)
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Failed to load documents: {e}")
@@ -185,10 +205,10 @@ async def analyze_company_endpoint(request_data: AnalyzeCompanyRequest, user_id:
     return await perform_company_analysis(company_name, str(user_company_file))
 
 @app.get("/apiText/load_last_company_analysis", response_class=JSONResponse)
-async def load_last_company_analysis(user_id: str = Depends(get_current_user)):
+async def load_last_company_analysis(request: Request, user_id: str = Depends(get_current_user)):
     company_file = _user_company_file(user_id)
     if not company_file.exists():
-        return JSONResponse(content={
+        return json_response(request, {
             "company_name": "",
             "summary": "",
             "core_values": [],
@@ -198,7 +218,7 @@ async def load_last_company_analysis(user_id: str = Depends(get_current_user)):
         })
     try:
         data = _load_json(company_file)
-        return JSONResponse(content=data)
+        return json_response(request, data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to read analysis: {e}")
 
@@ -320,8 +340,8 @@ async def portfolio_summary(
         current_version = int(version or 0)
         next_version = current_version + 1
 
-        # 현재 버전(vN)으로 요약/PDF 생성 및 JSON 저장
-        pdf_path, download_url, ai_summary = await summarize_portfolio_and_generate_pdf(
+        # 현재 버전(vN)으로 요약 (PDF는 최초 다운로드 시 생성)
+        download_url, ai_summary = await summarize_portfolio(
             user_id=user_id,
             file=portfolio_pdf,
             url=portfolio_link,
@@ -386,6 +406,8 @@ async def rollback_document(doc_type: str, job_slug: str, version: int, user_id:
                 try:
                     (doc_dir / name).unlink(missing_ok=False)
                     deleted.append(name)
+                    if doc_type == "portfolio":
+                        remove_summary_manifest(user_id, job_slug, v)
                 except Exception as e:
                     raise HTTPException(status_code=500, detail=f"Failed to delete {name}: {e}")
 
@@ -410,15 +432,19 @@ async def rollback_document(doc_type: str, job_slug: str, version: int, user_id:
 
 # -------- pdf download --------
 @app.get("/apiText/download_pdf/{job_slug}/{doc_type}/{filename}")
-async def download_pdf_file(job_slug: str, doc_type: str, filename: str, user_id: str = Depends(get_current_user)):
-    file_path = _user_doc_dir(user_id, job_slug, doc_type) / filename
+async def download_pdf_file(request: Request, job_slug: str, doc_type: str, filename: str, user_id: str = Depends(get_current_user)):
+    # 포트폴리오 요약 PDF는 요약 매니페스트 기준으로 (필요 시) 생성된 캐시 파일을 우선 사용
+    file_path = await ensure_portfolio_summary_pdf(user_id, job_slug, filename) if doc_type == "portfolio" else None
+    if file_path is None:
+        file_path = _user_doc_dir(user_id, job_slug, doc_type) / filename
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="File not found.")
     encoded_filename = quote(filename)
-    return FileResponse(
-        path=str(file_path),
+    # ETag(내용 해시)/Last-Modified 재검증 → 304, Range → 206
+    return await file_response(
+        request,
+        file_path,
         media_type="application/pdf",
-        filename=filename,
         headers={"Content-Disposition": f"attachment; filename*=UTF-8''{encoded_filename}"},
     )
 
@@ -0,0 +1,116 @@
+# pdf_service.py
+# 포트폴리오 요약 PDF 렌더링 서비스
+# - 폰트(NotoSansKR)는 워커 프로세스당 1회만 로드 (.pkl 캐시는 풀 생성 전 부모에서 1회 기록)
+# - 렌더링은 프로세스 풀에서 수행 (이벤트 루프/요청 경로 밖)
+# - 풀이 깨지면(BrokenProcessPool) 새 풀로 교체 후 1회 재시도
+import os
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from fpdf import FPDF
+
+BASE_DIR = Path(__file__).resolve().parent
+FONT_FAMILY = "NotoSansKR"
+FONT_PATH = BASE_DIR / "static" / "fonts" / "NotoSansKR-Regular.ttf"
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "2"))
+
+# 워커 프로세스 내부 전역: add_font 결과(메트릭/글리프 폭 테이블) 캐시
+_font_entry: Optional[Dict[str, Any]] = None
+_font_file_entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = asyncio.Lock()  # 풀 생성(및 부모 폰트 로드)을 한 번만
+
+
+# =========================
+# 워커 프로세스 (폰트 1회 로드)
+# =========================
+def _load_font_once() -> None:
+    global _font_entry, _font_file_entries
+    if _font_entry is not None:
+        return
+    if not FONT_PATH.exists():
+        raise FileNotFoundError(f"폰트 파일을 찾을 수 없습니다: {FONT_PATH}")
+    proto = FPDF()
+    proto.add_font(FONT_FAMILY, "", str(FONT_PATH), uni=True)
+    fontkey = FONT_FAMILY.lower()
+    _font_entry = proto.fonts[fontkey]
+    _font_file_entries = {k: v for k, v in proto.font_files.items() if k in (fontkey, str(FONT_PATH))}
+
+def _attach_font(pdf: FPDF) -> None:
+    """캐시된 폰트 항목을 새 문서에 연결 (TTF/pkl 재파싱 없음)."""
+    _load_font_once()
+    fontkey = FONT_FAMILY.lower()
+    entry = dict(_font_entry)
+    entry["i"] = len(pdf.fonts) + 1
+    # subset 목록은 출력 시 문서별로 변형되므로 복사본을 사용
+    entry["subset"] = list(_font_entry["subset"])
+    pdf.fonts[fontkey] = entry
+    for k, v in _font_file_entries.items():
+        pdf.font_files[k] = dict(v)
+
+def _pdf_bytes(pdf: FPDF) -> bytes:
+    out = pdf.output(dest="S")
+    return out.encode("latin-1") if isinstance(out, str) else bytes(out)
+
+def render_summary_pdf(job_title: Optional[str], summary_text: str) -> bytes:
+    """포트폴리오 요약 PDF를 렌더링해 바이트로 반환 (워커 프로세스에서 실행)."""
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    _attach_font(pdf)
+    pdf.set_font(FONT_FAMILY, "", 12)
+
+    title_text = f"{job_title or '포트폴리오'} 요약본\n"
+    pdf.multi_cell(0, 10, txt=title_text, align="C")
+    pdf.ln(10)
+    pdf.set_font(FONT_FAMILY, "", 14)
+    pdf.cell(0, 10, "▶ 포트폴리오 요약", ln=1, align="L")
+    pdf.set_font(FONT_FAMILY, "", 12)
+    pdf.multi_cell(0, 10, txt=summary_text)
+    pdf.ln(10)
+    return _pdf_bytes(pdf)
+
+
+# =========================
+# 프로세스 풀
+# =========================
+async def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    async with _executor_lock:
+        if _executor is None:
+            # 부모 프로세스에서 먼저 폰트를 로드해 fpdf의 .pkl 폰트 캐시를 한 번만 기록
+            # (콜드 스타트에 워커들이 같은 .pkl을 동시에 쓰고 읽다 EOFError로 풀이 깨지는 것 방지)
+            await asyncio.to_thread(_load_font_once)
+            _executor = ProcessPoolExecutor(max_workers=PDF_WORKERS, initializer=_load_font_once)
+        return _executor
+
+def _discard_executor(broken: ProcessPoolExecutor) -> None:
+    global _executor
+    if _executor is broken:
+        _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+async def _run_in_pool(job_title: Optional[str], summary_text: str) -> bytes:
+    executor = await _get_executor()
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(executor, render_summary_pdf, job_title, summary_text)
+    except BrokenProcessPool:
+        _discard_executor(executor)
+        raise
+
+async def render_summary_pdf_async(job_title: Optional[str], summary_text: str) -> bytes:
+    try:
+        return await _run_in_pool(job_title, summary_text)
+    except BrokenProcessPool:
+        return await _run_in_pool(job_title, summary_text)  # 새 풀로 1회 재시도
+
+def shutdown_pdf_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
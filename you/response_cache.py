@@ -0,0 +1,137 @@
+# response_cache.py
+# 직무 카탈로그 기준 정적 응답을 미리 바이트로 인코딩해 두는 캐시
+# - 시작 시/카탈로그 리로드 시 한 번만 직렬화 (JSON, HTML 페이지)
+# - ETag + Cache-Control(public)로 브라우저/CDN 캐시 활용
+import os
+import gzip
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from http_cache import is_not_modified
+from job_catalog import JobCatalog, get_catalog, on_catalog_reload
+from job_data import JOB_DOCUMENT_SCHEMAS, get_job_document_schema
+
+# 사용자와 무관한 정적 데이터 → 공유 캐시 허용
+STATIC_PAYLOAD_CACHE_CONTROL = os.getenv(
+    "STATIC_PAYLOAD_CACHE_CONTROL", "public, max-age=300, stale-while-revalidate=86400"
+)
+# HTML은 카탈로그 리로드가 바로 반영되도록 매번 재검증(304)
+PAGE_CACHE_CONTROL = os.getenv("PAGE_CACHE_CONTROL", "public, no-cache")
+PRECOMPRESS_PAGES = os.getenv("PRECOMPRESS_PAGES", "true").lower() in ("1", "true", "yes")
+
+BASE_DIR = Path(__file__).resolve().parent
+TEMPLATES_DIR = BASE_DIR / "templates"
+_jinja = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)), autoescape=select_autoescape(["html", "xml"]))
+
+
+class Encoded(NamedTuple):
+    body: bytes
+    etag: str
+    media_type: str
+    gzip_body: Optional[bytes] = None
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest() + '"'
+
+def encode_json(obj: Any) -> Encoded:
+    body = json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return Encoded(body, _etag(body), "application/json")
+
+def encode_page(template_name: str, context: Dict[str, Any]) -> Encoded:
+    body = _jinja.get_template(template_name).render(**context).encode("utf-8")
+    gz = gzip.compress(body, compresslevel=9, mtime=0) if PRECOMPRESS_PAGES else None
+    return Encoded(body, _etag(body), "text/html; charset=utf-8", gz)
+
+def _accepts_gzip(request: Request) -> bool:
+    return "gzip" in request.headers.get("accept-encoding", "").lower()
+
+def encoded_response(
+    request: Request,
+    entry: Encoded,
+    cache_control: str = STATIC_PAYLOAD_CACHE_CONTROL,
+) -> Response:
+    use_gzip = entry.gzip_body is not None and _accepts_gzip(request)
+    # 표현(압축 여부)마다 다른 강한 ETag
+    etag = entry.etag[:-1] + '-gz"' if use_gzip else entry.etag
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if entry.gzip_body is not None:
+        headers["Vary"] = "Accept-Encoding"
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=entry.gzip_body, media_type=entry.media_type, headers=headers)
+    return Response(content=entry.body, media_type=entry.media_type, headers=headers)
+
+
+# =========================
+# 스키마 / 카탈로그 페이로드 / 페이지
+# =========================
+_schemas: Dict[Tuple[str, str], Encoded] = {}  # (job_title, doc_type) → 인코딩된 스키마
+_catalog_payload: Optional[Encoded] = None
+_index_page: Optional[Encoded] = None
+_editor_pages: Dict[str, Encoded] = {}  # job_title → 렌더링된 에디터 페이지
+
+def _catalog_json(catalog: JobCatalog) -> Dict[str, Any]:
+    return {
+        "version": catalog.version,
+        "categories": [
+            {
+                "name": category,
+                "jobs": [{"title": t, "slug": catalog.slug_for_title(t)} for t in jobs],
+            }
+            for category, jobs in catalog.categories.items()
+        ],
+    }
+
+def _render_pages(catalog: JobCatalog) -> Tuple[Encoded, Dict[str, Encoded]]:
+    index_page = encode_page("index.html", {"job_categories": catalog.categories})
+    editor_pages = {
+        job_title: encode_page("document_editor.html", {
+            "job_title": job_title,
+            "job_slug": catalog.slug_for_title(job_title),
+            "job_details": catalog.get_details(job_title),
+        })
+        for job_title in catalog.titles
+    }
+    return index_page, editor_pages
+
+def rebuild(catalog: JobCatalog) -> None:
+    global _schemas, _catalog_payload, _index_page, _editor_pages
+    schemas: Dict[Tuple[str, str], Encoded] = {}
+    by_identity: Dict[int, Encoded] = {}  # 직무 공통 스키마는 한 번만 인코딩해 공유
+    for job_title in catalog.titles:
+        for doc_type in JOB_DOCUMENT_SCHEMAS:
+            schema = get_job_document_schema(job_title, doc_type)
+            if not schema:
+                continue
+            entry = by_identity.get(id(schema))
+            if entry is None:
+                entry = by_identity[id(schema)] = encode_json(schema)
+            schemas[(job_title, doc_type)] = entry
+    index_page, editor_pages = _render_pages(catalog)
+    _schemas, _catalog_payload = schemas, encode_json(_catalog_json(catalog))
+    _index_page, _editor_pages = index_page, editor_pages
+
+def get_schema_payload(job_title: str, doc_type: str) -> Optional[Encoded]:
+    return _schemas.get((job_title, doc_type))
+
+def get_catalog_payload() -> Encoded:
+    return _catalog_payload
+
+def get_index_page() -> Encoded:
+    return _index_page
+
+def get_editor_page(job_title: str) -> Optional[Encoded]:
+    return _editor_pages.get(job_title)
+
+on_catalog_reload(rebuild)
+rebuild(get_catalog())
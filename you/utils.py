@@ -1,21 +1,25 @@
 # utils.py
 from fastapi import HTTPException
 from fastapi.responses import JSONResponse
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 from pathlib import Path
 import os
+import re
+import time
 import aiofiles
 import json
 import traceback
+import uuid
+import asyncio
 from urllib.parse import unquote
 import hashlib
 import PyPDF2
 import numpy as np
 import io
-from fpdf import FPDF
 
-from job_data import JOB_CATEGORIES, JOB_DETAILS
+from job_catalog import get_catalog
 from prompts import get_document_analysis_prompt, get_company_analysis_prompt
+from pdf_service import render_summary_pdf_async
 from openai import OpenAI
 from dotenv import load_dotenv
 
@@ -28,14 +32,54 @@ OPENAI_MODEL = "gpt-4o"
 OPENAI_EMBEDDING_MODEL = "text-embedding-3-small"
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# ---- 프롬프트 prefix 캐시 지표 (호출 종류별) ----
+PROMPT_CACHE_STATS: Dict[str, Dict[str, float]] = {}
+
+def _record_prompt_usage(kind: str, response: Any, elapsed: float) -> None:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    details = getattr(usage, "prompt_tokens_details", None)
+    if isinstance(details, dict):
+        cached = details.get("cached_tokens") or 0
+    else:
+        cached = getattr(details, "cached_tokens", 0) or 0
+    st = PROMPT_CACHE_STATS.setdefault(kind, {
+        "calls": 0, "prompt_tokens": 0, "cached_tokens": 0,
+        "cached_calls": 0, "cached_latency": 0.0, "uncached_calls": 0, "uncached_latency": 0.0,
+    })
+    st["calls"] += 1
+    st["prompt_tokens"] += getattr(usage, "prompt_tokens", 0) or 0
+    st["cached_tokens"] += cached
+    bucket = "cached" if cached else "uncached"
+    st[f"{bucket}_calls"] += 1
+    st[f"{bucket}_latency"] += elapsed
+
+def get_prompt_cache_stats() -> Dict[str, Dict[str, float]]:
+    """cached-token 비율과 캐시 적중 시 평균 지연 단축(ms)."""
+    out: Dict[str, Dict[str, float]] = {}
+    for kind, st in PROMPT_CACHE_STATS.items():
+        avg_cached = st["cached_latency"] / st["cached_calls"] if st["cached_calls"] else 0.0
+        avg_uncached = st["uncached_latency"] / st["uncached_calls"] if st["uncached_calls"] else 0.0
+        out[kind] = {
+            "calls": st["calls"],
+            "cached_token_ratio": round(st["cached_tokens"] / st["prompt_tokens"], 4) if st["prompt_tokens"] else 0.0,
+            "avg_latency_cached_ms": round(avg_cached * 1000, 1),
+            "avg_latency_uncached_ms": round(avg_uncached * 1000, 1),
+            "latency_saved_ms": round((avg_uncached - avg_cached) * 1000, 1) if st["cached_calls"] and st["uncached_calls"] else 0.0,
+        }
+    return out
+
 # =========================
 # 경로
 # =========================
 BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "data"
 USERS_DIR = DATA_DIR / "users"
+PDF_CACHE_DIR = DATA_DIR / "pdf_cache"  # 요약 PDF: (job_title, 요약) 해시 → 파일
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(USERS_DIR, exist_ok=True)
+os.makedirs(PDF_CACHE_DIR, exist_ok=True)
 
 # ---- 사용자별 경로 헬퍼 ----
 def _user_base_dir(user_id: str) -> Path:
@@ -53,14 +97,13 @@ def _user_company_file(user_id: str) -> Path:
 # =========================
 # 공통 유틸
 # =========================
-def get_job_title_from_slug(job_slug: str) -> Optional[str]:
-    decoded_job_slug = unquote(job_slug)
-    for category_jobs in JOB_CATEGORIES.values():
-        for j_title in category_jobs:
-            normalized_j_title_slug = j_title.replace(" ", "-").replace("/", "-").lower()
-            if normalized_j_title_slug == decoded_job_slug:
-                return j_title
-    return None
+def get_job_title_from_slug(job_slug: str, fuzzy: bool = False) -> Optional[str]:
+    # 미리 계산된 slug/별칭 맵 조회 (fuzzy=True면 오타 허용)
+    return get_catalog().title_for_slug(job_slug, fuzzy=fuzzy)
+
+def canonical_job_slug(job_title: str) -> str:
+    # 별칭으로 들어온 요청도 데이터 경로는 정식 slug 디렉터리를 사용
+    return get_catalog().slug_for_title(job_title)
 
 def _cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
     if not vec1 or not vec2 or len(vec1) != len(vec2):
@@ -92,8 +135,8 @@ async def get_ai_feedback(
     company_analysis: Optional[Dict[str, Any]] = None,
 ) -> JSONResponse:
     try:
-        job_detail = JOB_DETAILS.get(job_title)
-        job_competencies_list = job_detail.get("competencies") if job_detail else None
+        job_detail = get_catalog().get_details(job_title)
+        job_competencies_list = job_detail.get("competencies") or None
 
         system_instruction, user_prompt = get_document_analysis_prompt(
             job_title=job_title,
@@ -109,6 +152,7 @@ async def get_ai_feedback(
         if user_prompt.startswith("오류:"):
             return JSONResponse(content={"error": user_prompt}, status_code=400)
 
+        t0 = time.perf_counter()
         response = client.chat.completions.create(
             model=OPENAI_MODEL,
             messages=[
@@ -117,6 +161,7 @@ async def get_ai_feedback(
             ],
             response_format={"type": "json_object"},
         )
+        _record_prompt_usage("document_analysis", response, time.perf_counter() - t0)
 
         ai_raw_response = response.choices[0].message.content.strip()
         parsed_feedback = json.loads(ai_raw_response)
@@ -190,11 +235,13 @@ async def perform_company_analysis(company_name: str, file_path: str | Path) ->
             )
 
         system_instruction, user_prompt = get_company_analysis_prompt(company_name)
+        t0 = time.perf_counter()
         response = client.chat.completions.create(
             model=OPENAI_MODEL,
             messages=[{"role": "system", "content": system_instruction}, {"role": "user", "content": user_prompt}],
             response_format={"type": "json_object"},
         )
+        _record_prompt_usage("company_analysis", response, time.perf_counter() - t0)
 
         ai_raw_response = response.choices[0].message.content.strip()
         parsed_analysis = json.loads(ai_raw_response)
@@ -213,58 +260,27 @@ async def perform_company_analysis(company_name: str, file_path: str | Path) ->
 # =========================
 # 파일 시스템 연동 (사용자별)
 # =========================
-async def load_documents_from_file_system(user_id: str, job_slug: str) -> Dict[str, List[Dict[str, Any]]]:
-    base = _user_job_dir(user_id, job_slug)
-    loaded_data: Dict[str, List[Dict[str, Any]]] = {"resume": [], "cover_letter": [], "portfolio": []}
-    if not base.exists():
-        return loaded_data
-
-    for doc_type in loaded_data.keys():
-        d = base / doc_type
-        if not d.exists():
-            continue
-        versions: List[Dict[str, Any]] = []
-        for p in d.iterdir():
-            if p.is_file() and p.suffix == ".json" and p.name.startswith("v"):
-                async with aiofiles.open(str(p), "r", encoding="utf-8") as f:
-                    content = await f.read()
-                try:
-                    doc_data = json.loads(content)
-                    doc_data.setdefault("individual_feedbacks", {})
-
-                    # 임베딩 없으면 생성 (신규 스키마 우선)
-                    if "embedding" not in doc_data or not doc_data["embedding"]:
-                        c = doc_data.get("content", {}) or {}
-                        text_to_embed = ""
-                        if doc_type == "cover_letter":
-                            cl_keys = [
-                                "reason_for_application",
-                                "expertise_experience",
-                                "collaboration_experience",
-                                "challenging_goal_experience",
-                                "growth_process",
-                            ]
-                            text_to_embed = " ".join([c.get(k, "") for k in cl_keys])
-                        elif doc_type == "resume":
-                            text_to_embed = " ".join([
-                                json.dumps(c.get("education", []), ensure_ascii=False),
-                                json.dumps(c.get("activities", []), ensure_ascii=False),
-                                json.dumps(c.get("awards", []), ensure_ascii=False),
-                                json.dumps(c.get("certificates", []), ensure_ascii=False),
-                            ])
-                        elif doc_type == "portfolio":
-                            text_to_embed = c.get("summary", "") or ""
-
-                        doc_data["embedding"] = await get_embedding(text_to_embed) if text_to_embed.strip() else []
-
-                    versions.append(doc_data)
-                except json.JSONDecodeError:
-                    print(f"Error decoding JSON from {p.name}")
-
-        versions.sort(key=lambda x: x.get("version", 0))
-        loaded_data[doc_type] = versions
-
-    return loaded_data
+def _stored_embedding_text(doc_type: str, c: Dict[str, Any]) -> str:
+    """저장된 문서(content)에서 임베딩용 텍스트 구성."""
+    if doc_type == "cover_letter":
+        cl_keys = [
+            "reason_for_application",
+            "expertise_experience",
+            "collaboration_experience",
+            "challenging_goal_experience",
+            "growth_process",
+        ]
+        return " ".join([c.get(k, "") for k in cl_keys])
+    if doc_type == "resume":
+        return " ".join([
+            json.dumps(c.get("education", []), ensure_ascii=False),
+            json.dumps(c.get("activities", []), ensure_ascii=False),
+            json.dumps(c.get("awards", []), ensure_ascii=False),
+            json.dumps(c.get("certificates", []), ensure_ascii=False),
+        ])
+    if doc_type == "portfolio":
+        return c.get("summary", "") or ""
+    return ""
 
 async def save_document_to_file_system(user_id: str, document_data: Dict[str, Any]):
     job_slug = document_data["job_title"].replace(" ", "-").replace("/", "-").lower()
@@ -282,6 +298,60 @@ async def save_document_to_file_system(user_id: str, document_data: Dict[str, An
 # =========================
 # 유사 이력 검색 (사용자별)
 # =========================
+# 검색 요청 doc_type → 실제 저장 디렉토리 (포트폴리오 요약은 portfolio 이력과 비교)
+HISTORY_DOC_DIRS = {
+    "resume": "resume",
+    "cover_letter": "cover_letter",
+    "portfolio": "portfolio",
+    "portfolio_summary_text": "portfolio",
+    "portfolio_summary_url": "portfolio",
+}
+# 검색/프롬프트 비교에 필요한 필드만 유지
+HISTORY_FIELDS = ("version", "content", "feedback", "embedding")
+_VERSION_FILE_RE = re.compile(r"v(\d+)\.json")
+
+async def iter_history_documents(
+    user_id: str,
+    job_slug: str,
+    doc_type: str,
+    below_version: int,
+    fields: Tuple[str, ...] = HISTORY_FIELDS,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    해당 doc_type 디렉토리에서 below_version 미만 버전만 최신순으로 하나씩 읽어 반환합니다.
+    버전은 파일명(vN.json)으로 먼저 거르므로 대상이 아닌 파일은 열지 않습니다.
+    """
+    dir_name = HISTORY_DOC_DIRS.get(doc_type)
+    if not dir_name:
+        return
+    doc_dir = _user_doc_dir(user_id, job_slug, dir_name)
+    if not doc_dir.is_dir():
+        return
+
+    candidates: List[Tuple[int, Path]] = []
+    with os.scandir(doc_dir) as it:
+        for entry in it:
+            m = _VERSION_FILE_RE.fullmatch(entry.name)
+            if m and int(m.group(1)) < below_version and entry.is_file():
+                candidates.append((int(m.group(1)), Path(entry.path)))
+    candidates.sort(key=lambda x: x[0], reverse=True)
+
+    for version, path in candidates:
+        async with aiofiles.open(str(path), "r", encoding="utf-8") as f:
+            raw = await f.read()
+        try:
+            doc_data = json.loads(raw)
+        except json.JSONDecodeError:
+            print(f"Error decoding JSON from {path.name}")
+            continue
+        doc = {k: doc_data[k] for k in fields if k in doc_data}
+        doc["version"] = version
+
+        if "embedding" in fields and not doc.get("embedding"):
+            text_to_embed = _stored_embedding_text(dir_name, doc_data.get("content", {}) or {})
+            doc["embedding"] = await get_embedding(text_to_embed) if text_to_embed.strip() else []
+        yield doc
+
 async def retrieve_relevant_feedback_history(
     user_id: str,
     job_slug: str,
@@ -290,11 +360,6 @@ async def retrieve_relevant_feedback_history(
     current_version: int,
     top_k: int = 2,
 ) -> List[Dict[str, Any]]:
-    # 모든 과거 문서
-    loaded_all_docs = await load_documents_from_file_system(user_id, job_slug)
-    all_docs_of_type: List[Dict[str, Any]] = [doc for doc in loaded_all_docs.get(doc_type, []) if doc.get("version", 0) < current_version]
-    all_docs_of_type.sort(key=lambda x: x.get("version", 0), reverse=True)
-
     # 현재 입력으로부터 임베딩 텍스트 구성
     text_for_current_embedding = ""
     if doc_type == "resume":
@@ -324,9 +389,10 @@ async def retrieve_relevant_feedback_history(
     if not current_embedding:
         return []
 
+    # 해당 타입의 과거 버전만 지연 로드
     sim_results: List[Tuple[float, Dict[str, Any]]] = []
-    for entry in all_docs_of_type:
-        if "embedding" not in entry or not entry["embedding"]:
+    async for entry in iter_history_documents(user_id, job_slug, doc_type, current_version):
+        if not entry.get("embedding"):
             continue
         similarity = _cosine_similarity(current_embedding, entry["embedding"])
         sim_results.append((similarity, entry))
@@ -337,9 +403,9 @@ async def retrieve_relevant_feedback_history(
     return retrieved_history
 
 # =========================
-# 포트폴리오 요약 & PDF
+# 포트폴리오 요약
 # =========================
-async def summarize_portfolio_and_generate_pdf(
+async def summarize_portfolio(
     user_id: str,
     file=None,
     url: Optional[str] = None,
@@ -416,37 +482,90 @@ async def summarize_portfolio_and_generate_pdf(
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"AI 요약 오류: {e}")
 
-    # PDF 생성 & 저장
+    # PDF는 최초 다운로드 시 생성 → 여기서는 버전별 요약 매니페스트만 기록
     try:
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_auto_page_break(auto=True, margin=15)
-
-        font_path = BASE_DIR / "static" / "fonts" / "NotoSansKR-Regular.ttf"
-        if not font_path.exists():
-            raise FileNotFoundError(f"폰트 파일을 찾을 수 없습니다: {font_path}")
-        pdf.add_font("NotoSansKR", "", str(font_path), uni=True)
-        pdf.set_font("NotoSansKR", "", 12)
-
-        title_text = f"{job_title or '포트폴리오'} 요약본\n"
-        pdf.multi_cell(0, 10, txt=title_text, align="C")
-        pdf.ln(10)
-        pdf.set_font("NotoSansKR", "", 14)
-        pdf.cell(0, 10, "▶ 포트폴리오 요약", ln=1, align="L")
-        pdf.set_font("NotoSansKR", "", 12)
-        pdf.multi_cell(0, 10, txt=overall_summary_text)
-        pdf.ln(10)
-
         job_slug = (job_title or "portfolio").replace(" ", "-").replace("/", "-").lower()
-        out_dir = _user_doc_dir(user_id, job_slug, "portfolio")
-        os.makedirs(out_dir, exist_ok=True)
+        pdf_version = version or 1
+        manifest = {
+            "job_title": job_title or "",
+            "summary": overall_summary_text,
+            "pdf_key": summary_pdf_key(job_title, overall_summary_text),
+        }
+        manifest_path = _summary_manifest_path(user_id, job_slug, pdf_version)
+        os.makedirs(manifest_path.parent, exist_ok=True)
+        async with aiofiles.open(str(manifest_path), "w", encoding="utf-8") as f:
+            await f.write(json.dumps(manifest, ensure_ascii=False))
+
+        pdf_filename = f"v{pdf_version}_summary.pdf"
+        return f"/api/download_pdf/{job_slug}/portfolio/{pdf_filename}", overall_summary_text
 
-        pdf_filename = f"v{(version or 1)}_summary.pdf"
-        pdf_file_path = out_dir / pdf_filename
-        pdf.output(str(pdf_file_path))
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"요약 저장 오류: {e}")
 
-        return str(pdf_file_path), f"/api/download_pdf/{job_slug}/portfolio/{pdf_filename}", overall_summary_text
+# =========================
+# 포트폴리오 요약 PDF (최초 다운로드 시 생성, 내용 해시로 재사용)
+# =========================
+SUMMARY_PDF_RE = re.compile(r"v(\d+)_summary\.pdf")
 
-    except Exception as e:
+def _summary_manifest_path(user_id: str, job_slug: str, version: int) -> Path:
+    return _user_doc_dir(user_id, job_slug, "portfolio") / "summaries" / f"v{version}.json"
+
+def remove_summary_manifest(user_id: str, job_slug: str, version: int) -> None:
+    """버전 문서가 삭제될 때 함께 지움 (캐시된 PDF는 내용 해시 기준이라 다른 버전과 공유될 수 있어 유지)."""
+    _summary_manifest_path(user_id, job_slug, version).unlink(missing_ok=True)
+
+def summary_pdf_key(job_title: Optional[str], summary_text: str) -> str:
+    return calculate_content_hash({"job_title": job_title or "", "summary": summary_text})
+
+async def ensure_portfolio_summary_pdf(user_id: str, job_slug: str, filename: str) -> Optional[Path]:
+    """
+    v{N}_summary.pdf 요청을 (job_title, 요약) 해시로 캐시된 PDF 경로로 해석합니다.
+    캐시에 없으면 이때 한 번 렌더링해 저장하고, 같은 요약의 다른 버전은 같은 파일을 재사용합니다.
+    """
+    m = SUMMARY_PDF_RE.fullmatch(filename)
+    if not m:
+        return None
+    manifest_path = _summary_manifest_path(user_id, job_slug, int(m.group(1)))
+    if not manifest_path.exists():
+        return None
+    try:
+        async with aiofiles.open(str(manifest_path), "r", encoding="utf-8") as f:
+            manifest = json.loads(await f.read())
+
+        pdf_key = manifest.get("pdf_key") or summary_pdf_key(manifest.get("job_title"), manifest.get("summary", ""))
+        pdf_path = PDF_CACHE_DIR / f"{pdf_key}.pdf"
+        if pdf_path.exists():
+            return pdf_path
+
+        # 같은 요약의 동시 첫 다운로드는 렌더링 한 번을 함께 기다림
+        task = _pdf_renders.get(pdf_key)
+        if task is None:
+            task = _pdf_renders[pdf_key] = asyncio.create_task(
+                _render_summary_pdf_file(pdf_key, pdf_path, manifest.get("job_title") or None, manifest.get("summary", ""))
+            )
+        return await asyncio.shield(task)
+    except Exception:
         traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"PDF 생성 및 저장 오류: {e}")
+        raise HTTPException(status_code=500, detail="PDF 생성 및 저장 오류")
+
+_pdf_renders: Dict[str, "asyncio.Task[Path]"] = {}  # pdf_key → 진행 중인 렌더링
+
+async def _render_summary_pdf_file(pdf_key: str, pdf_path: Path, job_title: Optional[str], summary: str) -> Path:
+    try:
+        pdf_bytes = await render_summary_pdf_async(job_title, summary)
+        # 요청마다 고유한 임시 파일 → 다른 워커와 겹쳐도 완성된 파일만 rename으로 노출
+        tmp_path = PDF_CACHE_DIR / f"{pdf_key}.{uuid.uuid4().hex}.tmp"
+        try:
+            async with aiofiles.open(str(tmp_path), "wb") as f:
+                await f.write(pdf_bytes)
+            os.replace(tmp_path, pdf_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return pdf_path
+    finally:
+        _pdf_renders.pop(pdf_key, None)